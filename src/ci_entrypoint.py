@@ -1,26 +1,51 @@
 #!/usr/bin/env python3
 # Investment Edge - Enhanced Entry Point with Dynamic Subject Lines
 import asyncio
+import atexit
+import functools
+import html as _html
 import importlib
-import inspect
 import logging
 import os
+import queue
 import sys
-import re
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-from mailer import send_html_email
+from mailer import send_html_email_async, close_pool
 
 HERE = Path(__file__).resolve().parent
 if str(HERE) not in sys.path:
     sys.path.insert(0, str(HERE))
 
+_HERO_OPEN = '<!-- HERO_HEADLINE:'
+_HERO_CLOSE = ' -->'
+
+CANDIDATE_FUNCS = (
+    "build_report_html","generate_report_html","render_report_html",
+    "build_weekly_html","generate_email_html","build_html",
+)
+CANDIDATE_CLASSES = ("StrategicIntelligenceEngine","IntelligenceEngine","ReportEngine")
+CANDIDATE_METHODS = (
+    "build_report_html","generate_report_html","render_html","to_html","compose_html","make_html",
+    "_harvest_constellation_data","_synthesize_strategic_news","_architect_executive_brief",
+)
+
+# inspect.CO_COROUTINE, checked directly to avoid importing inspect
+_CO_COROUTINE = 0x80
+
+# Resolved fallback modules, kept for retries within the same process
+_APP_CACHE: dict = {}
+# Candidate method names each engine class actually defines
+_METHOD_CACHE: dict = {}
+
 async def maybe_call(fn, *args, **kwargs):
-    if inspect.iscoroutinefunction(fn):
+    code = getattr(fn, "__code__", None)
+    if code is not None and code.co_flags & _CO_COROUTINE:
         return await fn(*args, **kwargs)
     result = fn(*args, **kwargs)
-    if inspect.isawaitable(result):
+    if hasattr(result, "__await__"):
         return await result
     return result
 
@@ -29,29 +54,51 @@ def extract_hero_headline(html):
     if not html:
         return None
     
-    # Look for the special comment
-    match = re.search(r'<!-- HERO_HEADLINE:(.*?) -->', html)
-    if match:
-        headline = match.group(1).strip()
-        # Unescape HTML entities
-        headline = headline.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-        return headline if headline else None
-    return None
+    # Look for the special comment (fixed literal, so plain find is enough)
+    start = html.find(_HERO_OPEN)
+    if start == -1:
+        return None
+    start += len(_HERO_OPEN)
+    end = html.find(_HERO_CLOSE, start)
+    if end == -1:
+        return None
+    headline = html[start:end].strip()
+    # Unescape HTML entities
+    if '&' in headline:
+        headline = _html.unescape(headline)
+    return headline if headline else None
 
-def generate_hero_based_subject(hero_headline=None):
-    """Generate Investment Edge subject line based on hero headline or fallback."""
-    today = datetime.now().strftime("%B %d")
-    current_hour = datetime.now().hour
-    
-    # Time-aware emoji
-    if 5 <= current_hour < 12:
+# Hero-based subject lines (using Investment Edge branding)
+_HERO_TPL = ("{e} {h}", "{h} • {d}", "📰 {h}", "⚡ {h}")
+# Fallback subjects with Investment Edge branding
+_FALLBACK_TPL = (
+    "{e} Investment Edge • {d}",
+    "📊 Portfolio Edge • {d}",
+    "⚡ Today's Market Edge",
+    "🎯 Investment Updates • {d}",
+    "💡 Strategic Edge • {d}",
+)
+
+@functools.lru_cache(maxsize=32)
+def _time_context(hour, month, day):
+    """Time-aware emoji and display date; cached per (hour, day) for batch sends."""
+    if 5 <= hour < 12:
         time_emoji = "🌅"
-    elif 12 <= current_hour < 17:
+    elif 12 <= hour < 17:
         time_emoji = "📊"
-    elif 17 <= current_hour < 21:
+    elif 17 <= hour < 21:
         time_emoji = "🌆"
     else:
         time_emoji = "🌙"
+    # 2000 is a leap year, so Feb 29 is representable
+    today = datetime(2000, month, day).strftime("%B %d")
+    return time_emoji, today
+
+def generate_hero_based_subject(hero_headline=None):
+    """Generate Investment Edge subject line based on hero headline or fallback."""
+    now = datetime.now()
+    current_hour = now.hour
+    time_emoji, today = _time_context(current_hour, now.month, now.day)
     
     if hero_headline:
         # Clean up the headline for subject use
@@ -59,37 +106,36 @@ def generate_hero_based_subject(hero_headline=None):
         
         # If headline is too long, truncate intelligently
         if len(hero_headline) > 60:
-            # Try to cut at a word boundary
-            hero_headline = hero_headline[:57].rsplit(' ', 1)[0] + "..."
-        
-        # Hero-based subject lines (using Investment Edge branding)
-        subjects = [
-            f"{time_emoji} {hero_headline}",
-            f"{hero_headline} • {today}",
-            f"📰 {hero_headline}",
-            f"⚡ {hero_headline}",
-        ]
+            # Try to cut at a word boundary, but not too early in the headline
+            cut = hero_headline[:57]
+            k = cut.rfind(' ')
+            hero_headline = (cut[:k] if k > 40 else cut) + "..."
         
-        # Pick one based on time of day
-        index = current_hour % len(subjects)
-        return subjects[index]
+        # Pick a hero-based subject based on time of day
+        tpl = _HERO_TPL[current_hour % len(_HERO_TPL)]
+        return tpl.format(e=time_emoji, h=hero_headline, d=today)
     
     else:
-        # Fallback subjects with Investment Edge branding
-        subjects = [
-            f"{time_emoji} Investment Edge • {today}",
-            f"📊 Portfolio Edge • {today}",
-            f"⚡ Today's Market Edge",
-            f"🎯 Investment Updates • {today}",
-            f"💡 Strategic Edge • {today}",
-        ]
-        
-        # Rotate based on day
-        day_index = datetime.now().timetuple().tm_yday % len(subjects)
-        return subjects[day_index]
+        # Rotate fallback subjects based on day
+        tpl = _FALLBACK_TPL[now.timetuple().tm_yday % len(_FALLBACK_TPL)]
+        return tpl.format(e=time_emoji, d=today)
+
+def _configure_logging() -> None:
+    """Log through a queue so stream writes happen on a listener thread, not the event loop."""
+    if logging.getLogger().handlers:
+        return  # already configured (basicConfig semantics)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    atexit.register(listener.stop)  # drains queued records before exit
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))  # the listener's handler adds the prefix
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
 async def main():
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    _configure_logging()
     logger = logging.getLogger("ci-entrypoint")
 
     html = None
@@ -104,24 +150,16 @@ async def main():
 
     if not html:
         logger.info("Falling back to engine dynamic builder")
-        CANDIDATE_FUNCS = [
-            "build_report_html","generate_report_html","render_report_html",
-            "build_weekly_html","generate_email_html","build_html",
-        ]
-        CANDIDATE_CLASSES = ["StrategicIntelligenceEngine","IntelligenceEngine","ReportEngine"]
-        CANDIDATE_METHODS = [
-            "build_report_html","generate_report_html","render_html","to_html","compose_html","make_html",
-            "_harvest_constellation_data","_synthesize_strategic_news","_architect_executive_brief",
-        ]
         try:
-            app = importlib.import_module("main")
+            app = _APP_CACHE.get("main") or _APP_CACHE.setdefault("main", importlib.import_module("main"))
         except Exception as e:
             logger.error("Could not import src/main.py as module 'main': %s", e)
             app = None
 
+        mod_dict = vars(app) if app else {}
         if app:
             for name in CANDIDATE_FUNCS:
-                fn = getattr(app, name, None)
+                fn = mod_dict.get(name)
                 if callable(fn):
                     logger.info("Using main.%s()", name)
                     html = await maybe_call(fn)
@@ -132,11 +170,16 @@ async def main():
 
         if not html and app:
             for cls_name in CANDIDATE_CLASSES:
-                cls = getattr(app, cls_name, None)
+                cls = mod_dict.get(cls_name)
                 if cls:
                     logger.info("Using engine class: %s", cls_name)
                     engine = cls()
-                    for m in CANDIDATE_METHODS[:6]:
+                    methods = _METHOD_CACHE.get(cls)
+                    if methods is None:
+                        methods = _METHOD_CACHE[cls] = tuple(
+                            m for m in CANDIDATE_METHODS[:6] if callable(getattr(cls, m, None))
+                        )
+                    for m in methods:
                         fn = getattr(engine, m, None)
                         if callable(fn):
                             logger.info("Using engine.%s()", m)
@@ -150,9 +193,9 @@ async def main():
                         synth = getattr(engine, "_synthesize_strategic_news", None)
                         arch = getattr(engine, "_architect_executive_brief", None)
                         if callable(harvest) and callable(synth) and callable(arch):
-                            logger.info("Using staged pipeline: harvest -> synthesize -> architect")
-                            market = await maybe_call(harvest)
-                            news = await maybe_call(synth)
+                            logger.info("Using staged pipeline: (harvest || synthesize) -> architect")
+                            # Market harvest and news synthesis are independent; overlap them
+                            market, news = await asyncio.gather(maybe_call(harvest), maybe_call(synth))
                             html = await maybe_call(arch, market, news)
 
     if not html or not isinstance(html, str):
@@ -170,9 +213,24 @@ async def main():
     logger.info(f"Generated subject: {subject}")
     logger.info(f"Email HTML length: {len(html)} characters")
 
-    send_html_email(html=html, subject=subject, logger=logger)
+    try:
+        await send_html_email_async(html=html, subject=subject, logger=logger)
+    finally:
+        close_pool()
     logger.info("Investment Edge email dispatch completed successfully")
     return 0
 
+def _run(coro):
+    """asyncio.run, with eager task execution on Python 3.12+.
+
+    Eager tasks run synchronously up to their first await, so the fetch fan-outs
+    start their HTTP requests without waiting a loop turn per task.
+    """
+    if sys.version_info >= (3, 12):
+        with asyncio.Runner() as runner:
+            runner.get_loop().set_task_factory(asyncio.eager_task_factory)
+            return runner.run(coro)
+    return asyncio.run(coro)
+
 if __name__ == "__main__":
-    raise SystemExit(asyncio.run(main()))
+    raise SystemExit(_run(main()))
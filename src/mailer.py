@@ -1,3 +1,8 @@
+import asyncio
+import atexit
+import functools
+import html as _html
+import itertools
 import os
 import re
 import smtplib
@@ -5,18 +10,99 @@ from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.header import Header
-from email.utils import make_msgid, formataddr
-import hashlib
-import socket
+from email.charset import Charset, QP
+from email.policy import compat32
+from email.utils import formataddr, format_datetime
+import secrets
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 
-_SURROGATE_RE = re.compile(r'[\ud800-\udfff]')
+# Lone surrogates (U+D800-U+DFFF) can't be encoded; translate() drops them in one C pass
+_SURROGATE_TABLE = dict.fromkeys(range(0xD800, 0xE000))
+_SPLIT_RE = re.compile(r"[;,\s]+")
+
+# UTF-8 bodies as quoted-printable: mostly-ASCII HTML stays readable and ~25% smaller than base64
+_QP_UTF8 = Charset("utf-8")
+_QP_UTF8.body_encoding = QP
+# Serialize with CRLF line endings so the bytes can go to DATA as-is
+_WIRE_POLICY = compat32.clone(linesep="\r\n")
+# Runs of characters outside the subject whitelist; anything else is spam-filter bait
+_SUBJECT_STRIP_RE = re.compile(r'[^\w\s\-\.\(\)\[\]!?,&$€£¥₹•→←↑↓★☆⭐🔥⚡📊📈💡🎯🌅☀️🌆🌙]+')
+_NON_ASCII_RE = re.compile(r'[^\x00-\x7F]+')
+_TAG_RE = re.compile(r'<[^>]+>')
+# Tags and whitespace runs in one alternation: split() leaves only the text fragments
+_STRIP_RE = re.compile(r'<[^>]+>|\s+')
+
+# Hero container patterns from render_email.py, each gated on literal anchors
+# (any one must occur in the lower-cased HTML) so absent layouts skip the scan
+_HERO_PATTERNS = tuple((anchors, re.compile(p, re.S | re.I)) for anchors, p in (
+    # Main hero container
+    (("linear-gradient",), r'<table[^>]*background[^>]*linear-gradient[^>]*>.*?<td[^>]*padding[^>]*>.*?<div[^>]*font-weight:700[^>]*font-size:24px[^>]*>(.*?)</div>(.*?)</td>.*?</table>'),
+    
+    # Alternative hero patterns
+    (('class="hero',), r'<div[^>]*class="hero[^"]*"[^>]*>(.*?)</div>'),
+    (("#111827",), r'<div[^>]*background[^>]*#111827[^>]*>.*?<div[^>]*font-size:2[24]px[^>]*>(.*?)</div>(.*?)</div>'),
+))
+_HEADLINE_PATTERNS = tuple((anchors, re.compile(p, re.S | re.I)) for anchors, p in (
+    (("<h1", "<h2"), r'<h[12][^>]*>(.*?)</h[12]>'),
+    (("font-size:2",), r'<div[^>]*font-size:2[0-9]px[^>]*font-weight:[67]00[^>]*>(.*?)</div>'),
+    (("font-size:",), r'<a[^>]*style="[^"]*font-size:[2-9][0-9]px[^"]*"[^>]*>(.*?)</a>'),
+))
+_DIV_AFTER_RE = re.compile(r'<div[^>]*>(.*?)</div>', re.S | re.I)
+_LINK_TEXT_RE = re.compile(r'<a[^>]*>(.*?)</a>', re.S | re.I)
+_HERO_DESC_RE = re.compile(r'<div[^>]*color[^>]*#d1d5db[^>]*>(.*?)</div>', re.S | re.I)
+_HERO_SOURCE_RE = re.compile(r'<span[^>]*font-weight:500[^>]*>(.*?)</span>', re.S | re.I)
+
+# Company performance snippets and up/down arrows for the preview fallbacks
+_PERF_PATTERNS = tuple(re.compile(p, re.I) for p in (
+    r'(\w+)\s*\([A-Z]{2,5}\)[^<]*?(\+?\-?\d+\.\d+%)',
+    r'<span[^>]*>([^<]+)</span>[^<]*?(\+?\-?\d+\.\d+%)',
+))
+# Separate patterns: a single alternation would let one arrow's match swallow the other
+_UP_ARROW_RE = re.compile(r'▲[^<]*?\+\d+\.\d+%')
+_DOWN_ARROW_RE = re.compile(r'▼[^<]*?\-\d+\.\d+%')
 
 def _split_recipients(raw: str):
     if not raw:
         return []
-    parts = re.split(r"[;,\s]+", raw)
+    parts = _SPLIT_RE.split(raw)
     return [p.strip() for p in parts if p.strip()]
 
+def merge_recipients(*groups):
+    """Concatenate address lists, keeping first occurrences (case-insensitive)."""
+    seen = set()
+    out = []
+    for a in itertools.chain(*groups):
+        k = a.lower()
+        if k in seen:
+            continue
+        seen.add(k)
+        out.append(a)
+    return out
+
+# Plain-text part used when the HTML carries too little text of its own
+_TEXT_ALT_FALLBACK = """INTELLIGENCE DIGEST
+
+{preview}
+
+This email contains your personalized Intelligence Digest with:
+• Real-time portfolio performance metrics
+• Breaking news and market analysis  
+• Strategic insights and investment signals
+• 52-week range tracking and momentum indicators
+
+For the full interactive experience with charts and enhanced formatting, 
+please view this email in an HTML-capable client.
+
+---
+Intelligence Digest • Engineered with Precision"""
+
+def _strip_html(html: str) -> str:
+    """Plain text of html with tags dropped and whitespace collapsed, in one regex pass."""
+    return " ".join(p for p in _STRIP_RE.split(html or "") if p)
+
 def _mask_local(local: str):
     if not local:
         return ""
@@ -25,23 +111,49 @@ def _mask_local(local: str):
     return local[:2] + "***" + local[-1:]
 
 def _mask_email(addr: str):
-    if not addr or "@" not in addr:
+    local, sep, domain = (addr or "").partition("@")
+    if not sep:
         return "***"
-    local, domain = addr.split("@", 1)
     return f"{_mask_local(local)}@{domain}"
 
 def _clean_subject(s: str) -> str:
     """Enhanced subject line cleaning with better character handling."""
     s = (s or "").replace("\r", " ").replace("\n", " ")
     s = " ".join(s.split())
-    s = _SURROGATE_RE.sub("", s)
+    s = s.translate(_SURROGATE_TABLE)
     # Remove problematic characters that might trigger spam filters
-    s = re.sub(r'[^\w\s\-\.\(\)\[\]!?,&$€£¥₹•→←↑↓★☆⭐🔥⚡📊📈💡🎯🌅☀️🌆🌙]+', ' ', s)
+    s = _SUBJECT_STRIP_RE.sub(' ', s)
     return s.strip()
 
-def _generate_enhanced_subject() -> str:
+# Enhanced subject templates with psychological triggers
+_SUBJECT_TEMPLATES = (
+    # Action-oriented
+    "{time_emoji} Intelligence Alert • {date_formatted} Market Signals",
+    "⚡ Breaking: {day_of_week} Portfolio Intelligence • {date_formatted}",
+    "🔥 {time_context} Brief • Critical Updates & Market Pulse",
+
+    # Value-focused
+    "💡 Strategic Intelligence • {date_formatted} Investment Insights",
+    "🎯 Portfolio Digest • {day_of_week} Performance & News",
+    "📈 Market Intelligence • {time_context} Edition {date_formatted}",
+
+    # Urgency-driven
+    "⚡ LIVE: {time_context} Market Pulse • Key Movements & Signals",
+    "🚀 Intelligence Update • {date_formatted} Strategic Opportunities",
+
+    # Professional
+    "📊 Executive Brief • {day_of_week} {time_context} Intelligence",
+    "💼 Strategic Update • {date_formatted} Portfolio & Market Analysis",
+)
+# Indices of the action-oriented templates preferred at peak hours
+_URGENT_SUBJECT_IDX = tuple(
+    i for i, t in enumerate(_SUBJECT_TEMPLATES)
+    if any(word in t for word in ("Alert", "Breaking", "LIVE", "Critical"))
+)
+
+def _generate_enhanced_subject(now: datetime = None) -> str:
     """Generate sophisticated, engagement-optimized subject lines."""
-    now = datetime.now()
+    now = now or datetime.now()
     current_hour = now.hour
     day_of_week = now.strftime("%A")
     date_formatted = now.strftime("%m/%d")
@@ -64,38 +176,15 @@ def _generate_enhanced_subject() -> str:
         time_context = "Late"
         urgency_level = "low"
     
-    # Enhanced subject templates with psychological triggers
-    subject_templates = [
-        # Action-oriented
-        f"{time_emoji} Intelligence Alert • {date_formatted} Market Signals",
-        f"⚡ Breaking: {day_of_week} Portfolio Intelligence • {date_formatted}",
-        f"🔥 {time_context} Brief • Critical Updates & Market Pulse",
-        
-        # Value-focused  
-        f"💡 Strategic Intelligence • {date_formatted} Investment Insights",
-        f"🎯 Portfolio Digest • {day_of_week} Performance & News",
-        f"📈 Market Intelligence • {time_context} Edition {date_formatted}",
-        
-        # Urgency-driven
-        f"⚡ LIVE: {time_context} Market Pulse • Key Movements & Signals",
-        f"🚀 Intelligence Update • {date_formatted} Strategic Opportunities",
-        
-        # Professional
-        f"📊 Executive Brief • {day_of_week} {time_context} Intelligence",
-        f"💼 Strategic Update • {date_formatted} Portfolio & Market Analysis"
-    ]
-    
-    # Select based on day and urgency
-    base_index = now.timetuple().tm_yday % len(subject_templates)
-    
-    # Adjust for urgency level
-    if urgency_level == "high":
+    # Pick the template first, then format only that one
+    idx = now.toordinal() % len(_SUBJECT_TEMPLATES)
+    if urgency_level == "high" and _URGENT_SUBJECT_IDX:
         # Prefer action-oriented subjects during peak hours
-        urgent_subjects = [s for s in subject_templates if any(word in s for word in ["Alert", "Breaking", "LIVE", "Critical"])]
-        if urgent_subjects:
-            return urgent_subjects[base_index % len(urgent_subjects)]
-    
-    return subject_templates[base_index]
+        idx = _URGENT_SUBJECT_IDX[idx % len(_URGENT_SUBJECT_IDX)]
+    return _SUBJECT_TEMPLATES[idx].format(
+        time_emoji=time_emoji, date_formatted=date_formatted,
+        day_of_week=day_of_week, time_context=time_context,
+    )
 
 def _extract_hero_content(html: str) -> dict:
     """Enhanced hero content extraction with multiple fallback strategies."""
@@ -105,54 +194,42 @@ def _extract_hero_content(html: str) -> dict:
     hero_content = {"title": "", "description": "", "source": ""}
     
     # Strategy 1: Look for hero container patterns from render_email.py
-    hero_patterns = [
-        # Main hero container
-        r'<table[^>]*background[^>]*linear-gradient[^>]*>.*?<td[^>]*padding[^>]*>.*?<div[^>]*font-weight:700[^>]*font-size:24px[^>]*>(.*?)</div>(.*?)</td>.*?</table>',
-        
-        # Alternative hero patterns
-        r'<div[^>]*class="hero[^"]*"[^>]*>(.*?)</div>',
-        r'<div[^>]*background[^>]*#111827[^>]*>.*?<div[^>]*font-size:2[24]px[^>]*>(.*?)</div>(.*?)</div>',
-    ]
-    
-    for pattern in hero_patterns:
-        matches = re.finditer(pattern, html, re.S | re.I)
-        for match in matches:
+    html_lc = html.lower()
+    for anchors, pattern in _HERO_PATTERNS:
+        if not any(a in html_lc for a in anchors):
+            continue
+        for match in pattern.finditer(html):
             # Extract title
             title_html = match.group(1)
-            title_link_match = re.search(r'<a[^>]*>(.*?)</a>', title_html, re.S | re.I)
+            title_link_match = _LINK_TEXT_RE.search(title_html)
             if title_link_match:
-                hero_content["title"] = re.sub(r'<[^>]+>', '', title_link_match.group(1)).strip()
+                hero_content["title"] = _TAG_RE.sub('', title_link_match.group(1)).strip()
             else:
-                hero_content["title"] = re.sub(r'<[^>]+>', '', title_html).strip()
+                hero_content["title"] = _TAG_RE.sub('', title_html).strip()
             
             # Extract description from remaining content
             if len(match.groups()) > 1:
                 remaining_content = match.group(2)
                 # Look for description in div tags
-                desc_match = re.search(r'<div[^>]*color[^>]*#d1d5db[^>]*>(.*?)</div>', remaining_content, re.S | re.I)
+                desc_match = _HERO_DESC_RE.search(remaining_content)
                 if desc_match:
-                    hero_content["description"] = re.sub(r'<[^>]+>', '', desc_match.group(1)).strip()
+                    hero_content["description"] = _TAG_RE.sub('', desc_match.group(1)).strip()
                 
                 # Look for source information
-                source_match = re.search(r'<span[^>]*font-weight:500[^>]*>(.*?)</span>', remaining_content, re.S | re.I)
+                source_match = _HERO_SOURCE_RE.search(remaining_content)
                 if source_match:
-                    hero_content["source"] = re.sub(r'<[^>]+>', '', source_match.group(1)).strip()
+                    hero_content["source"] = _TAG_RE.sub('', source_match.group(1)).strip()
             
             if hero_content["title"] and len(hero_content["title"]) > 10:
                 break
     
     # Strategy 2: Look for any prominent headlines in the content
     if not hero_content["title"]:
-        headline_patterns = [
-            r'<h[12][^>]*>(.*?)</h[12]>',
-            r'<div[^>]*font-size:2[0-9]px[^>]*font-weight:[67]00[^>]*>(.*?)</div>',
-            r'<a[^>]*style="[^"]*font-size:[2-9][0-9]px[^"]*"[^>]*>(.*?)</a>',
-        ]
-        
-        for pattern in headline_patterns:
-            matches = re.finditer(pattern, html, re.S | re.I)
-            for match in matches:
-                title_candidate = re.sub(r'<[^>]+>', '', match.group(1)).strip()
+        for anchors, pattern in _HEADLINE_PATTERNS:
+            if not any(a in html_lc for a in anchors):
+                continue
+            for match in pattern.finditer(html):
+                title_candidate = _TAG_RE.sub('', match.group(1)).strip()
                 # Skip generic titles
                 if (title_candidate and 
                     len(title_candidate) > 15 and 
@@ -166,33 +243,33 @@ def _extract_hero_content(html: str) -> dict:
     
     # Strategy 3: Extract description from content near the title
     if hero_content["title"] and not hero_content["description"]:
-        # Look for content after the title
-        title_escaped = re.escape(hero_content["title"])
-        content_after_title = re.search(
-            rf'{title_escaped}.*?<div[^>]*>(.*?)</div>',
-            html, re.S | re.I
-        )
+        # Look for content after the title: locate it with a plain case-insensitive
+        # find, then run the precompiled div pattern from there (offsets line up
+        # only when lower() kept the length, which is all but a few code points)
+        title = hero_content["title"]
+        content_after_title = None
+        if len(html_lc) == len(html):
+            pos = html_lc.find(title.lower())
+            if pos != -1:
+                content_after_title = _DIV_AFTER_RE.search(html, pos + len(title))
+        else:
+            content_after_title = re.search(rf'{re.escape(title)}.*?<div[^>]*>(.*?)</div>', html, re.S | re.I)
         if content_after_title:
-            desc_candidate = re.sub(r'<[^>]+>', '', content_after_title.group(1)).strip()
+            desc_candidate = _TAG_RE.sub('', content_after_title.group(1)).strip()
             if desc_candidate and len(desc_candidate) > 20:
                 hero_content["description"] = desc_candidate[:300]  # Limit length
     
     # Clean up extracted content
     for key in hero_content:
         if hero_content[key]:
-            # Clean HTML entities
-            hero_content[key] = (hero_content[key]
-                                .replace('&amp;', '&')
-                                .replace('&lt;', '<')
-                                .replace('&gt;', '>')
-                                .replace('&nbsp;', ' ')
-                                .strip())
+            # Clean HTML entities (all of them, in one pass; &nbsp; becomes a plain space)
+            hero_content[key] = _html.unescape(hero_content[key]).replace('\xa0', ' ').strip()
     
     return hero_content
 
-def _generate_smart_preview(html: str) -> str:
+def _generate_smart_preview(html: str, now: datetime = None) -> str:
     """Generate intelligent preview text that maximizes email opens."""
-    now = datetime.now()
+    now = now or datetime.now()
     current_time = now.strftime("%H:%M")
     
     # Extract hero content using enhanced extraction
@@ -218,7 +295,7 @@ def _generate_smart_preview(html: str) -> str:
             f"• Performance metrics, sentiment analysis & key developments"
         ]
         
-        suffix_index = now.timetuple().tm_yday % len(context_suffixes)
+        suffix_index = now.toordinal() % len(context_suffixes)
         preview = f"{hero['title']} {context_suffixes[suffix_index]}"
         
         return preview[:150] + "..." if len(preview) > 150 else preview
@@ -227,14 +304,8 @@ def _generate_smart_preview(html: str) -> str:
     card_content = []
     
     # Look for company performance information
-    perf_patterns = [
-        r'(\w+)\s*\([A-Z]{2,5}\)[^<]*?(\+?\-?\d+\.\d+%)',
-        r'<span[^>]*>([^<]+)</span>[^<]*?(\+?\-?\d+\.\d+%)',
-    ]
-    
-    for pattern in perf_patterns:
-        matches = re.finditer(pattern, html, re.I)
-        for match in matches:
+    for pattern in _PERF_PATTERNS:
+        for match in pattern.finditer(html):
             company = match.group(1).strip()
             perf = match.group(2)
             if company and not company.isdigit() and len(company) > 2:
@@ -247,8 +318,8 @@ def _generate_smart_preview(html: str) -> str:
         return preview[:150] + "..." if len(preview) > 150 else preview
     
     # Strategy 4: Market sentiment analysis
-    up_matches = len(re.findall(r'▲[^<]*?\+\d+\.\d+%', html))
-    down_matches = len(re.findall(r'▼[^<]*?\-\d+\.\d+%', html))
+    up_matches = len(_UP_ARROW_RE.findall(html))
+    down_matches = len(_DOWN_ARROW_RE.findall(html))
     total_positions = up_matches + down_matches
     
     if total_positions > 0:
@@ -273,32 +344,199 @@ def _generate_smart_preview(html: str) -> str:
         f"📊 Intelligence summary • Live performance metrics, news synthesis & key developments",
     ]
     
-    fallback_index = now.timetuple().tm_yday % len(fallback_options)
+    fallback_index = now.toordinal() % len(fallback_options)
     return fallback_options[fallback_index]
 
-def _generate_message_id(sender_email: str) -> str:
+def _generate_message_id(sender_email: str, now: datetime = None) -> str:
     """Generate unique, properly formatted Message-ID."""
-    timestamp = datetime.now().isoformat()
-    unique_str = f"{timestamp}-{os.getpid()}-{socket.gethostname()}"
-    hash_part = hashlib.md5(unique_str.encode()).hexdigest()[:12]
-    
-    if "@" in sender_email:
-        domain = sender_email.split("@")[1]
-    else:
+    _, at, domain = (sender_email or "").rpartition("@")
+    if not at or not domain:
         domain = "localhost"
-    
-    return f"<{hash_part}-{int(datetime.now().timestamp())}@{domain}>"
+    ts = int(now.timestamp()) if now else int(time.time())
+    return f"<{secrets.token_hex(6)}-{ts}@{domain}>"
+
+class _SMTPPool:
+    """Keeps one authenticated SMTP connection per thread open across sends."""
+
+    def __init__(self, host: str = "smtp.gmail.com", port: int = 587,
+                 idle_timeout: float = 100.0, max_sends: int = 100):
+        self.host = host
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.max_sends = max_sends
+        self._local = threading.local()
+        self._open_conns = set()  # every thread's connection, so close() can reach them all
+        self._lock = threading.Lock()
+
+    def _open(self, cfg: dict) -> smtplib.SMTP:
+        # 587 negotiates STARTTLS; 465 connects over TLS directly and saves a round trip per session
+        port = cfg.get("smtp_port") or self.port
+        implicit_tls = port == 465
+        server = (smtplib.SMTP_SSL if implicit_tls else smtplib.SMTP)(self.host, port)
+        try:
+            if cfg["smtp_debug"]:
+                server.set_debuglevel(1)
+            
+            # Enhanced connection setup
+            server.ehlo()
+            if not implicit_tls:
+                server.starttls()
+                server.ehlo()  # EHLO again after STARTTLS
+            
+            # Authentication with better error handling
+            try:
+                server.login(cfg["sender"], cfg["pwd"])
+            except smtplib.SMTPAuthenticationError as e:
+                raise RuntimeError(f"SMTP authentication failed: {e}") from e
+            except smtplib.SMTPException as e:
+                raise RuntimeError(f"SMTP login error: {e}") from e
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _alive(self, st) -> bool:
+        conn = getattr(st, "conn", None)
+        if conn is None:
+            return False
+        if time.monotonic() - st.last_use > self.idle_timeout or st.sends >= self.max_sends:
+            return False
+        try:
+            return conn.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _discard(self, st) -> None:
+        conn = getattr(st, "conn", None)
+        st.conn, st.key = None, None
+        if conn is None:
+            return
+        with self._lock:
+            self._open_conns.discard(conn)
+        self._quit(conn)
+
+    @staticmethod
+    def _quit(conn) -> None:
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    @contextmanager
+    def get(self, cfg: dict):
+        """Yield this thread's connection, reconnecting after 100 s idle, 100 sends, or a dead NOOP."""
+        st = self._local
+        key = (cfg["sender"], cfg["pwd"], cfg["smtp_debug"], cfg.get("smtp_port"))
+        if key != getattr(st, "key", None) or not self._alive(st):
+            self._discard(st)
+            conn = self._open(cfg)
+            with self._lock:
+                self._open_conns.add(conn)
+            st.conn, st.key, st.sends = conn, key, 0
+        try:
+            yield st.conn
+        except Exception:
+            # Connection state is unknown after a failure; don't reuse it
+            self._discard(st)
+            raise
+        st.last_use = time.monotonic()
+        st.sends += 1
+
+    def close(self) -> None:
+        with self._lock:
+            conns, self._open_conns = self._open_conns, set()
+        for conn in conns:
+            self._quit(conn)
+        self._local.conn = self._local.key = None
+
+_pool = _SMTPPool()
+
+# Cohort sender threads, created on the first batched send (sized by SMTP_CONCURRENCY)
+_EXECUTOR = None
+_EXECUTOR_WORKERS = 0
+_EXECUTOR_LOCK = threading.Lock()
+
+def _executor(workers: int) -> ThreadPoolExecutor:
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None or _EXECUTOR_WORKERS != workers:
+            if _EXECUTOR is not None:
+                _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="smtp")
+            _EXECUTOR_WORKERS = workers
+        return _EXECUTOR
+
+class PartialDeliveryError(RuntimeError):
+    """Some recipient cohorts were sent and others failed; re-send only to `failed`."""
+
+    def __init__(self, delivered: list, failed: list, errors: list):
+        super().__init__(f"SMTP delivered to {len(delivered)} recipients but failed for "
+                         f"{len(failed)}: {'; '.join(str(e) for e in errors)}")
+        self.delivered = delivered
+        self.failed = failed
+        self.errors = errors
+
+def smtp_connection(cfg: dict):
+    """Context manager lending this thread's pooled, authenticated SMTP connection."""
+    return _pool.get(cfg)
+
+def close_pool() -> None:
+    """Close all pooled SMTP connections. Also runs at interpreter exit."""
+    _pool.close()
+
+atexit.register(close_pool)
+
+# Environment variables read by validate_env, with their defaults
+_ENV_DEFAULTS = (
+    ("SENDER_EMAIL", None),
+    ("SENDER_NAME", ""),
+    ("REPLY_TO", ""),
+    ("SENDER_PASSWORD", None),
+    ("RECIPIENT_EMAILS", ""),
+    ("ADMIN_EMAILS", ""),
+    ("COPY_SENDER", "false"),
+    ("SMTP_DEBUG", "false"),
+    ("DRY_RUN", ""),
+    ("SMTP_PORT", "587"),
+    # Large recipient lists are split into cohorts sent over parallel SMTP sessions
+    ("SMTP_BATCH_SIZE", "50"),
+    ("SMTP_CONCURRENCY", "4"),
+)
+
+def _positive_int(raw: str, default: str = ""):
+    """Parse a positive integer setting (blank means default); None if it isn't one."""
+    raw = raw.strip() or default
+    return int(raw) if raw.isdigit() and int(raw) > 0 else None
 
 def validate_env():
     """Enhanced environment validation with better error messages."""
-    sender = os.getenv("SENDER_EMAIL")
-    sender_name = os.getenv("SENDER_NAME", "").strip()
-    reply_to = os.getenv("REPLY_TO", "").strip()
-    pwd = os.getenv("SENDER_PASSWORD")
-    recipients = _split_recipients(os.getenv("RECIPIENT_EMAILS", ""))
-    admin_emails = _split_recipients(os.getenv("ADMIN_EMAILS", ""))
-    copy_sender = os.getenv("COPY_SENDER", "false").lower() == "true"
-    smtp_debug = os.getenv("SMTP_DEBUG", "false").lower() == "true"
+    snapshot = tuple(os.environ.get(k, d) for k, d in _ENV_DEFAULTS)
+    cfg = dict(_validate_env_cached(snapshot))
+    # Copy the lists too, so a caller mutating them can't alter the memoized result
+    for key in ("recipients", "admin_emails", "missing"):
+        cfg[key] = list(cfg[key])
+    return cfg
+
+def reset_env_cache() -> None:
+    """Drop memoized validate_env results (e.g. after tests mutate os.environ)."""
+    _validate_env_cached.cache_clear()
+
+@functools.lru_cache(maxsize=1)
+def _validate_env_cached(snapshot: tuple) -> dict:
+    # Keyed by the raw env values, so a changed variable is re-parsed automatically
+    (sender, sender_name, reply_to, pwd, raw_recipients, raw_admins,
+     copy_sender, smtp_debug, dry_run, raw_port, raw_batch, raw_concurrency) = snapshot
+    sender_name = sender_name.strip()
+    reply_to = reply_to.strip()
+    recipients = _split_recipients(raw_recipients)
+    admin_emails = _split_recipients(raw_admins)
+    copy_sender = copy_sender.lower() == "true"
+    smtp_debug = smtp_debug.lower() == "true"
+    dry_run = dry_run.lower() == "true"
+    # Unset secrets arrive as empty strings; treat them like an absent variable
+    smtp_port = _positive_int(raw_port, "587")
+    batch_size = _positive_int(raw_batch, "50")
+    concurrency = _positive_int(raw_concurrency, "4")
 
     missing = []
     if not sender:
@@ -319,6 +557,12 @@ def validate_env():
         if invalid_recipients:
             missing.append(f"RECIPIENT_EMAILS (invalid: {', '.join(invalid_recipients)})")
 
+    for name, raw, value in (("SMTP_PORT", raw_port, smtp_port),
+                             ("SMTP_BATCH_SIZE", raw_batch, batch_size),
+                             ("SMTP_CONCURRENCY", raw_concurrency, concurrency)):
+        if value is None:
+            missing.append(f"{name} (must be a positive integer, got {raw!r})")
+
     return {
         "sender": sender,
         "sender_name": sender_name,
@@ -328,9 +572,61 @@ def validate_env():
         "admin_emails": admin_emails,
         "copy_sender": copy_sender,
         "smtp_debug": smtp_debug,
+        "dry_run": dry_run,
+        "smtp_port": smtp_port,
+        "batch_size": batch_size,
+        "concurrency": concurrency,
         "missing": missing
     }
 
+def _deliver(cfg: dict, to_addrs: list, msg_data) -> dict:
+    """Send already-serialized message data over the pooled connection.
+
+    No retry on disconnect: the server may already have accepted the message,
+    and stale connections are caught by the pool's NOOP check before use.
+    """
+    with _pool.get(cfg) as server:
+        return server.sendmail(cfg["sender"], to_addrs, msg_data)
+
+def _deliver_cohort(cfg: dict, to_addrs: list, msg_data) -> dict:
+    try:
+        return _deliver(cfg, to_addrs, msg_data)
+    except smtplib.SMTPRecipientsRefused as e:
+        # Other cohorts may still succeed; report these as refused like a partial failure
+        return dict(e.recipients)
+
+def _deliver_all(cfg: dict, to_addrs: list, msg_data) -> dict:
+    """Deliver to every recipient; lists longer than SMTP_BATCH_SIZE go out as parallel cohorts.
+
+    Raises PartialDeliveryError if some cohorts were sent and others failed.
+    """
+    size = cfg["batch_size"]
+    if len(to_addrs) <= size:
+        return _deliver(cfg, to_addrs, msg_data)
+    cohorts = [to_addrs[i:i + size] for i in range(0, len(to_addrs), size)]
+    refused = {}
+    delivered, failed, errors = [], [], []
+    # Each worker thread borrows its own pooled connection
+    executor = _executor(cfg["concurrency"])
+    futures = {executor.submit(_deliver_cohort, cfg, c, msg_data): c for c in cohorts}
+    for fut in as_completed(futures):
+        cohort = futures[fut]
+        try:
+            part = fut.result()
+        except Exception as e:
+            failed.extend(cohort)
+            errors.append(e)
+        else:
+            refused.update(part)
+            delivered.extend(a for a in cohort if a not in part)
+    if errors:
+        if not delivered:
+            raise errors[0]
+        raise PartialDeliveryError(delivered, failed, errors)
+    if len(refused) == len(to_addrs):
+        raise smtplib.SMTPRecipientsRefused(refused)
+    return refused
+
 def send_html_email(html: str, subject: str = None, logger=None) -> None:
     """Enhanced email sending with better deliverability and error handling."""
     cfg = validate_env()
@@ -341,11 +637,12 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
             logger.error(error_msg)
         raise RuntimeError(error_msg)
 
-    dry_run = os.getenv("DRY_RUN", "").lower() == "true"
+    dry_run = cfg["dry_run"]
+    now = datetime.now()  # one clock read shared by subject, preview and headers
 
     # Enhanced subject line generation
     if subject is None:
-        subject = _generate_enhanced_subject()
+        subject = _generate_enhanced_subject(now)
     subject = _clean_subject(subject)
 
     # Enhanced sender display name - CHANGED TO INVESTMENT EDGE
@@ -353,9 +650,6 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
     sender_disp = formataddr((sender_display_name, cfg["sender"]))
 
     # Enhanced logging with better information
-    masked_to = [_mask_email(r) for r in cfg["recipients"]]
-    masked_admins = [_mask_email(a) for a in cfg["admin_emails"]]
-    
     if logger:
         logger.info(f"Email config - Recipients: {len(cfg['recipients'])}, "
                    f"Admins: {len(cfg['admin_emails'])}, "
@@ -369,21 +663,24 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
     if len(cfg["recipients"]) > 3:
         msg["To"] += f", ... ({len(cfg['recipients']) - 3} more)"
     
-    # Enhanced subject with better encoding
-    try:
-        msg["Subject"] = str(Header(subject, "utf-8"))
-    except UnicodeEncodeError:
-        # Fallback with ASCII-safe subject
-        safe_subject = re.sub(r'[^\x00-\x7F]+', ' ', subject).strip()
-        safe_subject = safe_subject or "Intelligence Digest"
-        msg["Subject"] = str(Header(safe_subject, "utf-8"))
+    # Enhanced subject with better encoding (plain ASCII needs no RFC 2047 Header)
+    if subject.isascii():
+        msg["Subject"] = subject
+    else:
+        try:
+            msg["Subject"] = str(Header(subject, "utf-8"))
+        except UnicodeEncodeError:
+            # Fallback with ASCII-safe subject
+            safe_subject = _NON_ASCII_RE.sub(' ', subject).strip()
+            safe_subject = safe_subject or "Intelligence Digest"
+            msg["Subject"] = str(Header(safe_subject, "utf-8"))
 
     if cfg["reply_to"]:
         msg["Reply-To"] = cfg["reply_to"]
 
     # Enhanced email headers for better deliverability
-    msg["Message-ID"] = _generate_message_id(cfg["sender"])
-    msg["Date"] = datetime.now().strftime("%a, %d %b %Y %H:%M:%S %z") or datetime.now().strftime("%a, %d %b %Y %H:%M:%S +0000")
+    msg["Message-ID"] = _generate_message_id(cfg["sender"], now)
+    msg["Date"] = format_datetime(now.astimezone())  # RFC 5322, locale-independent, with zone
     msg["X-Mailer"] = "Intelligence Digest Engine v3.0"
     msg["X-Priority"] = "3"
     msg["Importance"] = "Normal"
@@ -410,35 +707,18 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
             msg[header] = value
 
     # Enhanced preview text extraction and injection
-    preview_text = _generate_smart_preview(html)
+    preview_text = _generate_smart_preview(html, now)
     
     if logger:
         preview_sample = preview_text[:80] + "..." if len(preview_text) > 80 else preview_text
         logger.info(f"Generated preview: '{preview_sample}'")
 
-    # Enhanced plain text version
-    text_alt = re.sub(r'<[^>]+>', ' ', html or "")
-    text_alt = re.sub(r'\s+', ' ', text_alt).strip()
+    # Enhanced plain text version; HTML under 100 chars can't yield 100 chars of text
+    text_alt = _strip_html(html) if html and len(html) >= 100 else ""
     
-    if not text_alt or len(text_alt) < 100:
+    if len(text_alt) < 100:
         # Create meaningful plain text fallback
-        text_alt = f"""
-INTELLIGENCE DIGEST
-
-{preview_text}
-
-This email contains your personalized Intelligence Digest with:
-• Real-time portfolio performance metrics
-• Breaking news and market analysis  
-• Strategic insights and investment signals
-• 52-week range tracking and momentum indicators
-
-For the full interactive experience with charts and enhanced formatting, 
-please view this email in an HTML-capable client.
-
----
-Intelligence Digest • Engineered with Precision
-        """.strip()
+        text_alt = _TEXT_ALT_FALLBACK.format(preview=preview_text)
 
     # Enhanced HTML preprocessing
     if html:
@@ -455,8 +735,8 @@ Intelligence Digest • Engineered with Precision
             html = html.replace("<body", preview_div + "<body", 1)
     
     # Attach content with proper encoding
-    msg.attach(MIMEText(text_alt, "plain", "utf-8"))
-    msg.attach(MIMEText(html or "", "html", "utf-8"))
+    msg.attach(MIMEText(text_alt, "plain", _QP_UTF8))
+    msg.attach(MIMEText(html or "", "html", _QP_UTF8))
 
     # Dry run handling
     if dry_run:
@@ -464,62 +744,47 @@ Intelligence Digest • Engineered with Precision
             logger.info(f"[DRY_RUN] Email ready to send:")
             logger.info(f"  Subject: '{subject}'")
             logger.info(f"  Preview: '{preview_text[:100]}...'")
-            logger.info(f"  Recipients: {masked_to}")
-            logger.info(f"  Admins: {masked_admins}")
+            logger.info(f"  Recipients: {[_mask_email(r) for r in cfg['recipients']]}")
+            logger.info(f"  Admins: {[_mask_email(a) for a in cfg['admin_emails']]}")
             logger.info(f"  HTML size: {len(html)} chars")
             logger.info(f"  Text size: {len(text_alt)} chars")
         return
 
-    # Enhanced recipient list building
-    to_addrs = list(dict.fromkeys(cfg["recipients"]))  # Dedupe while preserving order
-    
-    if cfg["copy_sender"] and cfg["sender"] not in to_addrs:
-        to_addrs.append(cfg["sender"])
-    
-    for admin in cfg["admin_emails"]:
-        if admin not in to_addrs:
-            to_addrs.append(admin)
+    # Enhanced recipient list building: one ordered pass, case-insensitive dedupe
+    copy_sender = [cfg["sender"]] if cfg["copy_sender"] else []
+    to_addrs = merge_recipients(cfg["recipients"], copy_sender, cfg["admin_emails"])
+
+    # Serialize once, straight to CRLF wire bytes; cohorts share the same data
+    # and smtplib skips its own str -> bytes transcoding pass
+    msg_data = msg.as_bytes(policy=_WIRE_POLICY)
 
     # Enhanced SMTP sending with better error handling
     try:
-        with smtplib.SMTP("smtp.gmail.com", 587) as server:
-            if cfg["smtp_debug"]:
-                server.set_debuglevel(1)
-            
-            # Enhanced connection setup
-            server.ehlo()
-            server.starttls()
-            server.ehlo()  # EHLO again after STARTTLS
-            
-            # Authentication with better error handling
-            try:
-                server.login(cfg["sender"], cfg["pwd"])
-            except smtplib.SMTPAuthenticationError as e:
-                raise RuntimeError(f"SMTP authentication failed: {e}") from e
-            except smtplib.SMTPException as e:
-                raise RuntimeError(f"SMTP login error: {e}") from e
-            
-            # Send message with delivery tracking
-            refused = server.sendmail(cfg["sender"], to_addrs, msg.as_string())
-            
-            # Enhanced logging
-            if logger:
-                masked_env = [_mask_email(x) for x in to_addrs]
-                logger.info(f"Email sent successfully:")
-                logger.info(f"  Subject: '{subject}'")
-                logger.info(f"  Recipients: {len(to_addrs)} addresses")
-                logger.info(f"  Preview: '{preview_text[:60]}...'")
-                
-                if refused:
-                    logger.warning(f"Some recipients were refused: {refused}")
-                else:
-                    logger.info("All recipients accepted by server")
+        # Send message with delivery tracking
+        refused = _deliver_all(cfg, to_addrs, msg_data)
+        
+        # Enhanced logging
+        if logger:
+            logger.info(f"Email sent successfully:")
+            logger.info(f"  Subject: '{subject}'")
+            logger.info(f"  Recipients: {len(to_addrs)} addresses")
+            logger.info(f"  Preview: '{preview_text[:60]}...'")
             
-            # Handle partial failures
             if refused:
-                refused_addrs = list(refused.keys())
-                raise RuntimeError(f"SMTP refused {len(refused_addrs)} recipients: {refused_addrs}")
+                logger.warning(f"Some recipients were refused: {refused}")
+            else:
+                logger.info("All recipients accepted by server")
+        
+        # Handle partial failures
+        if refused:
+            refused_addrs = list(refused.keys())
+            raise RuntimeError(f"SMTP refused {len(refused_addrs)} recipients: {refused_addrs}")
                 
+    except PartialDeliveryError as e:
+        if logger:
+            logger.error(f"Partial delivery: {len(e.delivered)} sent, {len(e.failed)} failed: "
+                         f"{[_mask_email(a) for a in e.failed]}")
+        raise
     except smtplib.SMTPRecipientsRefused as e:
         raise RuntimeError(f"All recipients were refused: {e}") from e
     except smtplib.SMTPServerDisconnected as e:
@@ -528,3 +793,7 @@ Intelligence Digest • Engineered with Precision
         raise RuntimeError(f"SMTP error: {e}") from e
     except Exception as e:
         raise RuntimeError(f"Unexpected email error: {e}") from e
+
+async def send_html_email_async(html: str, subject: str = None, logger=None) -> None:
+    """Async variant of send_html_email; the blocking SMTP exchange runs in a worker thread."""
+    await asyncio.to_thread(send_html_email, html, subject, logger)
@@ -1,18 +1,26 @@
 import os
 import re
-import smtplib
 from datetime import datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.header import Header
 from email.utils import make_msgid, formataddr
 
-_SURROGATE_RE = re.compile(r'[\ud800-\udfff]')
+from mailer import merge_recipients, smtp_connection
+
+# Lone surrogates (U+D800-U+DFFF) can't be encoded; translate() drops them in one C pass
+_SURROGATE_TABLE = dict.fromkeys(range(0xD800, 0xE000))
+_SPLIT_RE = re.compile(r"[;,\s]+")
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+# Hero articles are wrapped in this specific pattern from _render_hero()
+_HERO_TITLE_RE = re.compile(r'<div[^>]*font-weight:700[^>]*font-size:22px[^>]*>.*?<a[^>]*>(.*?)</a>.*?</div>', re.S | re.I)
+_HERO_CONTAINER_RE = re.compile(r'<table[^>]*border-collapse:collapse[^>]*background:#111827[^>]*>.*?<td[^>]*padding:16px[^>]*>(.*?)</td>', re.S | re.I)
 
 def _split_recipients(raw: str):
     if not raw:
         return []
-    parts = re.split(r"[;,\s]+", raw)
+    parts = _SPLIT_RE.split(raw)
     return [p.strip() for p in parts if p.strip()]
 
 def _mask_local(local: str):
@@ -31,9 +39,21 @@ def _mask_email(addr: str):
 def _clean_subject(s: str) -> str:
     s = (s or "").replace("\r", " ").replace("\n", " ")
     s = " ".join(s.split())
-    s = _SURROGATE_RE.sub("", s)
+    s = s.translate(_SURROGATE_TABLE)
     return s.strip()
 
+# Subject templates; only the one selected for the day is formatted
+_SUBJECT_TEMPLATES = (
+    "{e} Intelligence Digest • {d} Market Pulse",
+    "📊 Strategic Brief • {w} {c} Edition",
+    "🎯 Portfolio Intelligence • {d} Key Signals",
+    "⚡ Market Update • {c} Intelligence Summary",
+    "🔍 Intelligence Digest • {d} Strategic Insights",
+    "📈 {w} Brief • Portfolio & Market Intelligence",
+    "🚀 Strategic Update • {d} Investment Intelligence",
+    "💡 Market Intelligence • {c} Digest {d}",
+)
+
 def _generate_dynamic_subject() -> str:
     """Generate engaging, dynamic subject lines with variety."""
     now = datetime.now()
@@ -55,48 +75,41 @@ def _generate_dynamic_subject() -> str:
         time_emoji = "🌙"
         time_context = "Late"
     
-    # Dynamic subject templates
-    subject_templates = [
-        f"{time_emoji} Intelligence Digest • {date_formatted} Market Pulse",
-        f"📊 Strategic Brief • {day_of_week} {time_context} Edition",
-        f"🎯 Portfolio Intelligence • {date_formatted} Key Signals", 
-        f"⚡ Market Update • {time_context} Intelligence Summary",
-        f"🔍 Intelligence Digest • {date_formatted} Strategic Insights",
-        f"📈 {day_of_week} Brief • Portfolio & Market Intelligence",
-        f"🚀 Strategic Update • {date_formatted} Investment Intelligence",
-        f"💡 Market Intelligence • {time_context} Digest {date_formatted}"
-    ]
-    
     # Rotate based on day of year for consistency but variety
-    template_index = now.timetuple().tm_yday % len(subject_templates)
-    return subject_templates[template_index]
+    template_index = now.timetuple().tm_yday % len(_SUBJECT_TEMPLATES)
+    return _SUBJECT_TEMPLATES[template_index].format(
+        e=time_emoji, c=time_context, w=day_of_week, d=date_formatted)
 
-def _extract_preview_from_html(html: str) -> str:
-    """Extract hero article headline for inbox preview text."""
+def _strip_html(html: str) -> str:
+    """Tags replaced by spaces, whitespace collapsed."""
+    return _WS_RE.sub(' ', _TAG_RE.sub(' ', html or "")).strip()
+
+def _extract_preview_from_html(html: str, stripped: str = None) -> str:
+    """Extract hero article headline for inbox preview text (stripped: precomputed _strip_html(html))."""
     if not html:
         return "Strategic market intelligence and portfolio insights"
     
     # 🔥 FIXED: Look specifically for hero article title pattern
-    # Hero articles are wrapped in this specific pattern from _render_hero()
-    hero_title_pattern = r'<div[^>]*font-weight:700[^>]*font-size:22px[^>]*>.*?<a[^>]*>(.*?)</a>.*?</div>'
-    hero_match = re.search(hero_title_pattern, html, re.S | re.I)
+    # Cheap substring prechecks: the backtracking patterns below only run
+    # when their literal anchors are present somewhere in the document
+    html_lc = html.lower()
+    hero_match = _HERO_TITLE_RE.search(html) if "font-size:22px" in html_lc else None
     
     if hero_match:
-        hero_title = re.sub(r'<[^>]+>', '', hero_match.group(1)).strip()
+        hero_title = _TAG_RE.sub('', hero_match.group(1)).strip()
         if hero_title and len(hero_title) > 10:
             # Clean up any HTML entities and return clean title
             hero_title = hero_title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
             return hero_title[:140] + "..." if len(hero_title) > 140 else hero_title
     
     # Fallback 1: Look for any hero article container content
-    hero_container_pattern = r'<table[^>]*border-collapse:collapse[^>]*background:#111827[^>]*>.*?<td[^>]*padding:16px[^>]*>(.*?)</td>'
-    container_match = re.search(hero_container_pattern, html, re.S | re.I)
+    container_match = _HERO_CONTAINER_RE.search(html) if "background:#111827" in html_lc else None
     
     if container_match:
         container_content = container_match.group(1)
         # Extract first meaningful text that's not "Intelligence Digest"
-        text_content = re.sub(r'<[^>]+>', ' ', container_content)
-        text_content = re.sub(r'\s+', ' ', text_content).strip()
+        text_content = _TAG_RE.sub(' ', container_content)
+        text_content = _WS_RE.sub(' ', text_content).strip()
         
         # Split into sentences and find first substantial one
         sentences = [s.strip() for s in text_content.split('.') if len(s.strip()) > 15]
@@ -106,8 +119,7 @@ def _extract_preview_from_html(html: str) -> str:
     
     # Fallback 2: Look for any significant news content
     # Find content that looks like news headlines (longer than 20 chars, not metadata)
-    text_content = re.sub(r'<[^>]+>', ' ', html)
-    text_content = re.sub(r'\s+', ' ', text_content).strip()
+    text_content = stripped if stripped is not None else _strip_html(html)
     
     sentences = [s.strip() for s in text_content.split('.') if len(s.strip()) > 20]
     meaningful_sentences = [s for s in sentences if not any(word in s.lower() for word in 
@@ -121,22 +133,23 @@ def _extract_preview_from_html(html: str) -> str:
     # Final fallback to dynamic preview
     return _generate_dynamic_preview()
 
+# Preview templates; only the one selected for the day is formatted
+_PREVIEW_TEMPLATES = (
+    "Market intelligence update {t} • Key movements, sentiment analysis & strategic signals",
+    "Portfolio pulse check {t} • Performance insights, news highlights & market momentum",
+    "Strategic briefing {t} • Top movers, sector analysis & breaking developments",
+    "Intelligence summary {t} • Market data, portfolio updates & strategic opportunities",
+    "Market snapshot {t} • Real-time insights, news synthesis & investment signals",
+)
+
 def _generate_dynamic_preview() -> str:
     """Generate compelling preview text that encourages opens."""
     now = datetime.now()
     current_time = now.strftime("%H:%M")
     
-    preview_options = [
-        f"Market intelligence update {current_time} • Key movements, sentiment analysis & strategic signals",
-        f"Portfolio pulse check {current_time} • Performance insights, news highlights & market momentum", 
-        f"Strategic briefing {current_time} • Top movers, sector analysis & breaking developments",
-        f"Intelligence summary {current_time} • Market data, portfolio updates & strategic opportunities",
-        f"Market snapshot {current_time} • Real-time insights, news synthesis & investment signals"
-    ]
-    
     # Rotate preview based on day to maintain freshness
-    preview_index = now.timetuple().tm_yday % len(preview_options)
-    return preview_options[preview_index]
+    preview_index = now.timetuple().tm_yday % len(_PREVIEW_TEMPLATES)
+    return _PREVIEW_TEMPLATES[preview_index].format(t=current_time)
 
 def validate_env():
     sender = os.getenv("SENDER_EMAIL")
@@ -147,6 +160,7 @@ def validate_env():
     admin_emails = _split_recipients(os.getenv("ADMIN_EMAILS", ""))
     copy_sender = os.getenv("COPY_SENDER", "false").lower() == "true"  # default false in v5
     smtp_debug = os.getenv("SMTP_DEBUG", "false").lower() == "true"
+    smtp_port = os.getenv("SMTP_PORT", "").strip() or "587"  # blank (unset secret) means default
 
     missing = []
     if not sender:
@@ -155,6 +169,8 @@ def validate_env():
         missing.append("SENDER_PASSWORD")
     if not recipients:
         missing.append("RECIPIENT_EMAILS")
+    if not smtp_port.isdigit() or int(smtp_port) == 0:
+        missing.append("SMTP_PORT (must be a positive integer)")
 
     return {
         "sender": sender,
@@ -165,6 +181,7 @@ def validate_env():
         "admin_emails": admin_emails,
         "copy_sender": copy_sender,
         "smtp_debug": smtp_debug,
+        "smtp_port": int(smtp_port) if smtp_port.isdigit() else None,
         "missing": missing
     }
 
@@ -189,8 +206,9 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
     masked_to = [_mask_email(r) for r in cfg["recipients"]]
     masked_admins = [_mask_email(a) for a in cfg["admin_emails"]]
     if logger:
-        eq_sender = any(r.lower() == cfg["sender"].lower() for r in cfg["recipients"])
-        logger.info(f"Recipients(masked)={masked_to} | Admins(masked)={masked_admins} | any_to_equals_sender={eq_sender} | copy_sender={cfg['copy_sender']} | dry_run={dry_run}")
+        sender_lc = cfg["sender"].lower()
+        eq_sender = any(r.lower() == sender_lc for r in cfg["recipients"])
+        logger.info("Recipients(masked)=%s | Admins(masked)=%s | any_to_equals_sender=%s | copy_sender=%s | dry_run=%s", masked_to, masked_admins, eq_sender, cfg['copy_sender'], dry_run)
 
     msg = MIMEMultipart("alternative")
     msg["From"] = sender_disp
@@ -209,7 +227,7 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
     run_attempt = os.getenv("GITHUB_RUN_ATTEMPT", "")
     run_number = os.getenv("GITHUB_RUN_NUMBER", "")
     sha = os.getenv("GITHUB_SHA", "")[:12]
-    domain_list = sorted({addr.split("@",1)[1] for addr in cfg["recipients"] if "@" in addr})
+    domain_list = sorted({addr.rsplit("@", 1)[-1] for addr in cfg["recipients"] if "@" in addr})
     
     msg["Message-ID"] = make_msgid(domain=(cfg["sender"].split("@",1)[1] if "@" in cfg["sender"] else None))
     msg["X-GitHub-Run-ID"] = run_id
@@ -226,12 +244,12 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
     msg["X-Auto-Response-Suppress"] = "OOF, DR, RN, NRN, AutoReply"
 
     # 🔥 FIXED: Extract hero article headline for preview
-    preview_text = _extract_preview_from_html(html)
+    # Strip the body once; shared by the preview fallback and the plain-text part
+    stripped = _strip_html(html)
+    preview_text = _extract_preview_from_html(html, stripped)
     
     # Create enhanced plain text version with preview
-    import re as _re
-    text_alt = _re.sub(r"<[^>]+>", " ", html or "")
-    text_alt = _re.sub(r"\s+", " ", text_alt).strip()
+    text_alt = stripped
     
     if not text_alt:
         text_alt = f"{preview_text}\n\nThis email contains your Intelligence Digest with market data, portfolio insights, and strategic analysis."
@@ -246,29 +264,23 @@ def send_html_email(html: str, subject: str = None, logger=None) -> None:
 
     if dry_run:
         if logger:
-            logger.info(f"[DRY_RUN] Would send. Subject='{subject}' | Preview='{preview_text[:60]}...' | To(masked)={masked_to} | Admins(masked)={masked_admins}")
+            logger.info("[DRY_RUN] Would send. Subject='%s' | Preview='%s...' | To(masked)=%s | Admins(masked)=%s", subject, preview_text[:60], masked_to, masked_admins)
         return
 
     # Build envelope recipients with dedupe
-    to_addrs = list(dict.fromkeys(cfg["recipients"]))  # preserve order, drop dups
-    if cfg["copy_sender"] and cfg["sender"] not in to_addrs:
-        to_addrs.append(cfg["sender"])
-    for a in cfg["admin_emails"]:
-        if a not in to_addrs:
-            to_addrs.append(a)
+    extras = ([cfg["sender"]] if cfg["copy_sender"] else []) + cfg["admin_emails"]
+    to_addrs = merge_recipients(cfg["recipients"], extras)
 
-    with smtplib.SMTP("smtp.gmail.com", 587) as server:
-        if cfg["smtp_debug"]:
-            server.set_debuglevel(1)
-        server.starttls()
-        server.login(cfg["sender"], cfg["pwd"])
-        refused = server.sendmail(cfg["sender"], to_addrs, msg.as_string())
-        if logger:
-            masked_env = [_mask_email(x) for x in to_addrs]
-            logger.info(f"Envelope recipients(masked)={masked_env}")
-            logger.info(f"SMTP refused recipients map: {refused!r}")
-            logger.info(f"Email sent with subject: '{subject}' and hero preview: '{preview_text[:60]}...'")
-        if refused:
-            raise RuntimeError(f"SMTP refused some recipients: {refused}")
-        if logger:
-            logger.info(f"Email handed to SMTP for {len(to_addrs)} recipient(s).")
+    # Reuse the pooled connection (and its TLS session) across sends. No retry on
+    # disconnect: the server may already have accepted the message
+    with smtp_connection(cfg) as server:
+        refused = server.send_message(msg, from_addr=cfg["sender"], to_addrs=to_addrs)
+    if logger:
+        masked_env = [_mask_email(x) for x in to_addrs]
+        logger.info("Envelope recipients(masked)=%s", masked_env)
+        logger.info("SMTP refused recipients map: %r", refused)
+        logger.info("Email sent with subject: '%s' and hero preview: '%s...'", subject, preview_text[:60])
+    if refused:
+        raise RuntimeError(f"SMTP refused some recipients: {refused}")
+    if logger:
+        logger.info("Email handed to SMTP for %s recipient(s).", len(to_addrs))
@@ -8,16 +8,32 @@
 
 from __future__ import annotations
 from typing import Dict, Any, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
+import asyncio
+from bisect import bisect_left
+import functools
+import hashlib
+import io
 import json, os, time, re
-import traceback
-import random
+import threading
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+from urllib.request import urlopen, Request
+from xml.etree import ElementTree as ET
 
 try:
     from zoneinfo import ZoneInfo
 except Exception:
     ZoneInfo = None
 
+try:
+    import orjson  # optional: C JSON parser, several times faster than stdlib json
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 from render_email import render_email
 
 CENTRAL_TZ = ZoneInfo("America/Chicago") if ZoneInfo else None
@@ -43,32 +59,112 @@ def _parse_iso(value: Optional[str]) -> Optional[datetime]:
     except Exception:
         return None
 
+@functools.cache
+def _requests():
+    """(requests, HTTPAdapter), imported on first HTTP call; None when not installed."""
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+    except Exception:
+        return None
+    return requests, HTTPAdapter
+
+@functools.cache
+def _yf():
+    """yfinance (and the pandas it pulls in), imported on first use."""
+    import yfinance
+    return yfinance
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def _http_session():
+    """Shared keep-alive requests.Session (None when requests isn't installed)."""
+    global _SESSION
+    mods = _requests()
+    if mods is None:
+        return None
+    requests, HTTPAdapter = mods
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            # No adapter-level retries: _http_get_json already retries, and retrying a 429
+            # underneath the rate limiters would only spend more of the API quota
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+def _close_http_session() -> None:
+    """Close the shared session's pooled connections; the next request opens a new one."""
+    global _SESSION
+    with _SESSION_LOCK:
+        session, _SESSION = _SESSION, None
+    if session is not None:
+        session.close()
+
+def _http_get_bytes(url: str, timeout: float, headers: Dict[str, str]) -> bytes:
+    """GET url and return the raw body, reusing pooled connections when possible."""
+    session = _http_session()
+    if session is not None:
+        resp = session.get(url, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        return resp.content
+    with urlopen(Request(url, headers=headers), timeout=timeout) as resp:
+        return resp.read()
+
+def _http_get_conditional(url: str, timeout: float, headers: Dict[str, str]) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """GET url with validator headers; returns (None, {}) on 304 Not Modified, else (body, cache validators)."""
+    session = _http_session()
+    if session is not None:
+        resp = session.get(url, headers=headers, timeout=timeout)
+        if resp.status_code == 304:
+            return None, {}
+        resp.raise_for_status()
+        body, resp_headers = resp.content, resp.headers
+    else:
+        try:
+            with urlopen(Request(url, headers=headers), timeout=timeout) as resp:
+                body, resp_headers = resp.read(), resp.headers
+        except HTTPError as e:
+            if e.code == 304:
+                return None, {}
+            raise
+    validators = {}
+    for name in ("ETag", "Last-Modified"):
+        value = resp_headers.get(name)
+        if value:
+            validators[name] = value
+    return body, validators
+
 def _http_get_json(url: str, timeout: float = 25.0, headers: Optional[Dict[str, str]] = None, logger=None) -> Optional[Dict[str, Any]]:
     """Minimal stdlib GET with retry and logging"""
     for attempt in range(3):
         try:
-            from urllib.request import urlopen, Request
             hdrs = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"}
             if headers: hdrs.update(headers)
-            req = Request(url, headers=hdrs)
             
             if logger:
                 # Log URL without sensitive API keys
                 safe_url = re.sub(r'(apikey|api_key|key)=[^&]+', r'\1=***', url)
-                logger.info(f"HTTP GET attempt {attempt+1}: {safe_url[:100]}...")
+                logger.info("HTTP GET attempt %s: %s...", attempt+1, safe_url[:100])
             
-            with urlopen(req, timeout=timeout) as resp:
-                raw = resp.read()
+            raw = _http_get_bytes(url, timeout, hdrs)
                 
-            result = json.loads(raw.decode("utf-8", errors="replace"))
+            try:
+                result = _json_loads(raw)
+            except ValueError:
+                # Stray invalid UTF-8 or NaN literals: fall back to the lenient stdlib path
+                result = json.loads(raw.decode("utf-8", errors="replace"))
             
             if logger:
-                logger.info(f"HTTP GET success, response size: {len(raw)} bytes")
+                logger.info("HTTP GET success, response size: %s bytes", len(raw))
             
             return result
         except Exception as e:
             if logger:
-                logger.warning(f"HTTP GET attempt {attempt+1} failed: {str(e)}")
+                logger.warning("HTTP GET attempt %s failed: %s", attempt+1, e)
             if attempt < 2:
                 time.sleep(2 ** attempt)
                 continue
@@ -77,13 +173,11 @@ def _http_get_json(url: str, timeout: float = 25.0, headers: Optional[Dict[str,
 def _http_get_text(url: str, timeout: float = 15.0, logger=None) -> Optional[str]:
     """Get plain text/HTML response."""
     try:
-        from urllib.request import urlopen, Request
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=timeout) as resp:
-            return resp.read().decode("utf-8", errors="replace")
+        raw = _http_get_bytes(url, timeout, {"User-Agent": "Mozilla/5.0"})
+        return raw.decode("utf-8", errors="replace")
     except Exception as e:
         if logger:
-            logger.warning(f"HTTP GET text failed: {str(e)}")
+            logger.warning("HTTP GET text failed: %s", e)
         return None
 
 # ----------------------- Config / Sources -----------------------
@@ -91,6 +185,29 @@ def _http_get_text(url: str, timeout: float = 15.0, logger=None) -> Optional[str
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 ALPHA_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 
+# Max assets fetched in parallel (each fetch runs in a worker thread)
+FETCH_CONCURRENCY = 8
+
+# Alpha Vantage free tier allows 5 requests/minute; workers that would wait longer
+# than ALPHA_MAX_WAIT for a token skip straight to the yfinance fallback
+ALPHA_RATE_PER_MIN = float(os.getenv("ALPHA_VANTAGE_RPM", "5"))
+ALPHA_MAX_WAIT = float(os.getenv("ALPHA_VANTAGE_MAX_WAIT", "15"))
+# After a rate-limit reply ("Note"/"Information"), hold off Alpha Vantage for one quota window
+ALPHA_COOLDOWN = float(os.getenv("ALPHA_VANTAGE_COOLDOWN", "60"))
+# CoinGecko's public API throttles at roughly 30 calls/minute
+COINGECKO_RATE_PER_MIN = float(os.getenv("COINGECKO_RPM", "30"))
+
+# On-disk cache for fetched price history (prior-day bars don't change within a day)
+CACHE_DIR = os.getenv("CI_CACHE_DIR", ".ci_cache")
+PRICE_CACHE_TTL = 6 * 3600  # seconds
+# NewsAPI bodies for the same query are identical within a run window; reuse them
+NEWS_CACHE_TTL = 3600  # seconds
+# RSS entries keep their ETag/Last-Modified so unchanged feeds come back as an empty 304
+RSS_VALIDATOR_TTL = 7 * 24 * 3600  # seconds
+# Per-asset NewsAPI lookups are OR-combined into a few queries (NewsAPI caps q at 500 chars)
+NEWSAPI_MAX_QUERY = 500
+NEWSAPI_BATCH_PAGE_SIZE = 100
+
 COINGECKO_IDS = {
     "BTC-USD": "bitcoin",
     "ETH-USD": "ethereum",
@@ -107,15 +224,96 @@ COMMODITY_MAP = {
     "CPER": {"name": "Copper", "unit": "lb", "symbol": "COPPER"},
 }
 
+# ----------------------- Disk Cache -----------------------
+
+def _cache_load(name: str, ttl: float) -> Optional[Any]:
+    """Return the cached JSON value for name if it is younger than ttl seconds."""
+    path = os.path.join(CACHE_DIR, name)
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _cache_store(name: str, value: Any) -> None:
+    """Write value as JSON under CACHE_DIR; failures are ignored (cache is best-effort)."""
+    path = os.path.join(CACHE_DIR, name)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(value, f)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
+# ----------------------- Rate Limiting -----------------------
+
+class _TokenBucket:
+    """Thread-safe token bucket shared by the fetch worker threads."""
+
+    def __init__(self, per_minute: float, burst: Optional[float] = None):
+        self.rate = max(per_minute, 0.001) / 60.0
+        self.capacity = burst if burst is not None else max(per_minute, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, max_wait: Optional[float] = None) -> bool:
+        """Take one token, sleeping until one is free; False if that would exceed max_wait."""
+        with self.lock:
+            self._refill()
+            wait = (1.0 - self.tokens) / self.rate if self.tokens < 1.0 else 0.0
+            if max_wait is not None and wait > max_wait:
+                return False
+            # Reserve the token now so concurrent callers queue up behind it
+            self.tokens -= 1.0
+        if wait:
+            time.sleep(wait)
+        return True
+
+    def pause(self, seconds: float) -> None:
+        """Drain the bucket so no token is free for the next `seconds` (server said slow down)."""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, 1.0 - seconds * self.rate)
+
+_ALPHA_LIMITER = _TokenBucket(ALPHA_RATE_PER_MIN)
+_COINGECKO_LIMITER = _TokenBucket(COINGECKO_RATE_PER_MIN)
+
+def _news_cache_name(query: str) -> str:
+    return f"newsapi_{hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]}.json"
+
+def _rss_cache_name(symbol: str) -> str:
+    safe = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+    return f"rss_{safe}.json"
+
+def _price_cache_name(symbol: str) -> str:
+    safe = re.sub(r'[^A-Za-z0-9._-]', '_', symbol)
+    return f"prices_{safe}_{_ct_now().date().isoformat()}.json"
+
 # ----------------------- Data Loading -----------------------
 
+_WATCHLIST_PATH = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data", "watchlist.json"))
+
 def _load_watchlist() -> List[Dict[str, Any]]:
     """Load watchlist.json from ../data WITHOUT changing order."""
-    here = os.path.dirname(os.path.abspath(__file__))
-    path_watch = os.path.normpath(os.path.join(here, "..", "data", "watchlist.json"))
-    
-    with open(path_watch, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    # Parsed once per file version; callers get fresh dicts they are free to mutate
+    assets = _parse_watchlist(_WATCHLIST_PATH, os.stat(_WATCHLIST_PATH).st_mtime_ns)
+    return [dict(a) for a in assets]
+
+@functools.lru_cache(maxsize=1)
+def _parse_watchlist(path_watch: str, mtime_ns: int) -> Tuple[Dict[str, Any], ...]:
+    """Parse the watchlist at path_watch; mtime_ns keys the cache so edits are picked up."""
+    with open(path_watch, "rb") as f:
+        data = _json_loads(f.read())
     
     # Now expecting: { "sections": [ { "name": "...", "category": "...", "assets":[...] }, ... ] }
     sections = data.get("sections") or []
@@ -137,7 +335,7 @@ def _load_watchlist() -> List[Dict[str, Any]]:
                 "coingecko_id": a.get("coingecko_id"),
             }
             assets.append(out)
-    return assets
+    return tuple(assets)
 
 # ----------------------- Commodity Price Fetching -----------------------
 
@@ -149,6 +347,10 @@ def _fetch_commodity_prices(logger=None) -> Dict[str, Dict[str, Any]]:
     if ALPHA_KEY:
         # Gold and Silver from Alpha Vantage CURRENCY_EXCHANGE_RATE
         for metal, code in [("GOLD", "XAU"), ("SILVER", "XAG")]:
+            if not _ALPHA_LIMITER.acquire(ALPHA_MAX_WAIT):
+                if logger:
+                    logger.info("Alpha Vantage quota busy, skipping %s spot price", metal)
+                continue
             try:
                 url = f"https://www.alphavantage.co/query?function=CURRENCY_EXCHANGE_RATE&from_currency={code}&to_currency=USD&apikey={ALPHA_KEY}"
                 data = _http_get_json(url, logger=logger)
@@ -162,10 +364,12 @@ def _fetch_commodity_prices(logger=None) -> Dict[str, Dict[str, Any]]:
                             "name": "Gold" if metal == "GOLD" else "Silver"
                         }
                         if logger:
-                            logger.info(f"Got {metal} price from Alpha Vantage: ${price:.2f}/oz")
+                            logger.info("Got %s price from Alpha Vantage: $%.2f/oz", metal, price)
+                elif data and ("Note" in data or "Information" in data):
+                    _ALPHA_LIMITER.pause(ALPHA_COOLDOWN)
             except Exception as e:
                 if logger:
-                    logger.warning(f"Failed to get {metal} from Alpha Vantage: {e}")
+                    logger.warning("Failed to get %s from Alpha Vantage: %s", metal, e)
     
     # Try fetching from YFinance symbols with ENHANCED percentage calculations
     commodity_symbols = {
@@ -177,47 +381,45 @@ def _fetch_commodity_prices(logger=None) -> Dict[str, Dict[str, Any]]:
     }
     
     try:
-        import yfinance as yf
+        yf = _yf()
         for commodity, symbol in commodity_symbols.items():
             if commodity not in prices:  # Skip if already have price
                 try:
                     ticker = yf.Ticker(symbol)
-                    info = ticker.info
                     
-                    # Get enough history for all calculations
-                    hist = ticker.history(period="1mo")  # Get 1 month for 1W and 1M calculations
+                    # One year of history covers 1D/1W/1M, YTD and the 52-week range
+                    hist = ticker.history(period="1y")
                     
                     if not hist.empty:
-                        current_price = float(hist['Close'].iloc[-1])
+                        close = hist['Close']
+                        current_price = float(close.iloc[-1])
                         
                         # Calculate 1D percentage change
                         pct_1d = 0
                         if len(hist) >= 2:
-                            pct_1d = ((hist['Close'].iloc[-1] / hist['Close'].iloc[-2]) - 1) * 100
+                            pct_1d = ((close.iloc[-1] / close.iloc[-2]) - 1) * 100
                         
                         # Calculate 1W percentage change (5 trading days)
                         pct_1w = 0
                         if len(hist) >= 6:
-                            pct_1w = ((hist['Close'].iloc[-1] / hist['Close'].iloc[-6]) - 1) * 100
+                            pct_1w = ((close.iloc[-1] / close.iloc[-6]) - 1) * 100
                         
                         # Calculate 1M percentage change (22 trading days)
                         pct_1m = 0
                         if len(hist) >= 22:
-                            pct_1m = ((hist['Close'].iloc[-1] / hist['Close'].iloc[-22]) - 1) * 100
+                            pct_1m = ((close.iloc[-1] / close.iloc[-22]) - 1) * 100
                         
                         # Calculate YTD percentage change
                         pct_ytd = 0
-                        current_year = datetime.now().year
-                        hist_ytd = ticker.history(period="ytd")
-                        if not hist_ytd.empty and len(hist_ytd) > 1:
+                        close_ytd = close[hist.index.year == datetime.now().year]
+                        if len(close_ytd) > 1:
                             # Get first trading day of the year
-                            first_price_ytd = hist_ytd['Close'].iloc[0]
+                            first_price_ytd = close_ytd.iloc[0]
                             pct_ytd = ((current_price / first_price_ytd) - 1) * 100
                         
                         # Get 52-week data
-                        hist_year = ticker.history(period="1y")
-                        low_52w = float(hist_year['Low'].min()) if not hist_year.empty else current_price
-                        high_52w = float(hist_year['High'].max()) if not hist_year.empty else current_price
+                        low_52w = float(hist['Low'].min())
+                        high_52w = float(hist['High'].max())
                         
                         prices[commodity] = {
                             "price": current_price,
@@ -232,10 +434,10 @@ def _fetch_commodity_prices(logger=None) -> Dict[str, Dict[str, Any]]:
                         }
                         
                         if logger:
-                            logger.info(f"Got {commodity} from yfinance: ${current_price:.2f}, 1D={pct_1d:.1f}%, 1W={pct_1w:.1f}%, 1M={pct_1m:.1f}%, YTD={pct_ytd:.1f}%")
+                            logger.info("Got %s from yfinance: $%.2f, 1D=%.1f%%, 1W=%.1f%%, 1M=%.1f%%, YTD=%.1f%%", commodity, current_price, pct_1d, pct_1w, pct_1m, pct_ytd)
                 except Exception as e:
                     if logger:
-                        logger.warning(f"Failed to get {commodity} from yfinance: {e}")
+                        logger.warning("Failed to get %s from yfinance: %s", commodity, e)
     except ImportError:
         if logger:
             logger.warning("yfinance not available for commodity prices")
@@ -244,7 +446,6 @@ def _fetch_commodity_prices(logger=None) -> Dict[str, Dict[str, Any]]:
     if "GOLD" not in prices:
         try:
             # This is a simplified example - in production you'd want more robust scraping
-            import re
             html = _http_get_text("https://www.kitco.com/market/", logger=logger)
             if html:
                 # Look for gold price pattern (this is very fragile and just an example)
@@ -262,46 +463,82 @@ def _fetch_commodity_prices(logger=None) -> Dict[str, Dict[str, Any]]:
                         "pct_ytd": 0
                     }
                     if logger:
-                        logger.info(f"Scraped GOLD price: ${price_str}/oz")
+                        logger.info("Scraped GOLD price: $%s/oz", price_str)
         except Exception as e:
             if logger:
-                logger.warning(f"Failed to scrape gold price: {e}")
+                logger.warning("Failed to scrape gold price: %s", e)
     
     return prices
 
 # ----------------------- YFinance Fallback -----------------------
 
+# Daily closes pre-fetched by _yfinance_daily_many, consulted before per-symbol calls
+_YF_BATCH: Dict[str, Tuple[List[str], List[float]]] = {}
+
+def _yfinance_daily_many(symbols: List[str], logger=None) -> Dict[str, Tuple[List[str], List[float]]]:
+    """Get daily prices for many symbols with a single yfinance download."""
+    out: Dict[str, Tuple[List[str], List[float]]] = {}
+    if not symbols:
+        return out
+    try:
+        yf = _yf()
+        
+        if logger:
+            logger.info("Batch yfinance download for %s symbols", len(symbols))
+        
+        df = yf.download(tickers=symbols, period="6mo", interval="1d", group_by="ticker",
+                         auto_adjust=True, progress=False, threads=True)
+        if df is None or df.empty:
+            return out
+        
+        multi = getattr(df.columns, "nlevels", 1) > 1
+        for sym in symbols:
+            try:
+                close = (df[sym]["Close"] if multi else df["Close"]).dropna()
+            except KeyError:
+                continue
+            if close.empty:
+                continue
+            out[sym] = (close.index.strftime("%Y-%m-%d").tolist(), close.astype(float).tolist())
+        
+        if logger:
+            logger.info("Batch yfinance returned data for %s/%s symbols", len(out), len(symbols))
+    except Exception as e:
+        if logger:
+            logger.warning("Batch yfinance download failed: %s", e)
+    return out
+
 def _yfinance_daily(symbol: str, logger=None) -> Tuple[List[str], List[float]]:
     """Get daily prices using yfinance (already in requirements.txt)."""
+    cached = _YF_BATCH.get(symbol)
+    if cached:
+        return cached
     try:
-        import yfinance as yf
+        yf = _yf()
         
         if logger:
-            logger.info(f"Trying yfinance for {symbol}")
+            logger.info("Trying yfinance for %s", symbol)
         
         ticker = yf.Ticker(symbol)
         hist = ticker.history(period="6mo")  # Get 6 months of data
         
         if hist.empty:
             if logger:
-                logger.warning(f"yfinance returned no data for {symbol}")
+                logger.warning("yfinance returned no data for %s", symbol)
             return [], []
         
-        dates = []
-        closes = []
-        
-        for date, row in hist.iterrows():
-            dates.append(date.strftime("%Y-%m-%d"))
-            closes.append(float(row['Close']))
+        # Column-wise conversion instead of a per-row iterrows() walk
+        dates = hist.index.strftime("%Y-%m-%d").tolist()
+        closes = hist["Close"].astype(float).tolist()
         
         if logger and len(closes) > 0:
-            logger.info(f"yfinance success for {symbol}: {len(closes)} prices, latest=${closes[-1]:.2f}")
+            logger.info("yfinance success for %s: %s prices, latest=$%.2f", symbol, len(closes), closes[-1])
         
         return dates, closes
         
     except Exception as e:
         if logger:
-            logger.warning(f"yfinance failed for {symbol}: {str(e)}")
+            logger.warning("yfinance failed for %s: %s", symbol, e)
         return [], []
 
 # ----------------------- Stooq with proper symbol formatting -----------------------
@@ -317,25 +554,23 @@ def _stooq_daily(symbol: str, logger=None) -> Tuple[List[str], List[float]]:
         url = f"https://stooq.com/q/d/l/?s={stooq_symbol}&i=d"
         
         if logger:
-            logger.info(f"Trying Stooq for {symbol} as {stooq_symbol}")
+            logger.info("Trying Stooq for %s as %s", symbol, stooq_symbol)
         
-        from urllib.request import urlopen, Request
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=15.0) as resp:
-            raw = resp.read().decode("utf-8", errors="replace")
+        raw = _http_get_bytes(url, 15.0, {"User-Agent": "Mozilla/5.0"}).decode("utf-8", errors="replace")
         
         lines = raw.strip().split("\n")
         if len(lines) < 2:
             if logger:
-                logger.warning(f"Stooq returned no data for {stooq_symbol}")
+                logger.warning("Stooq returned no data for %s", stooq_symbol)
             return [], []
         
         dates = []
         closes = []
         
-        # Skip header
-        for line in lines[1:]:
-            parts = line.split(",")
+        # Walk back from the newest row (skipping the header) and stop once
+        # the last 120 days are collected; older rows are never parsed
+        for line in reversed(lines[1:]):
+            parts = line.split(",", 5)
             if len(parts) >= 5:
                 date = parts[0]
                 close = parts[4]  # Close price is 5th column
@@ -343,124 +578,219 @@ def _stooq_daily(symbol: str, logger=None) -> Tuple[List[str], List[float]]:
                     price = float(close)
                     dates.append(date)
                     closes.append(price)
-                except:
+                except ValueError:
                     continue
+                if len(closes) == 120:
+                    break
+        dates.reverse()
+        closes.reverse()
         
         if logger and len(closes) > 0:
-            logger.info(f"Stooq success for {symbol}: {len(closes)} prices, latest=${closes[-1]:.2f}")
+            logger.info("Stooq success for %s: %s prices, latest=$%.2f", symbol, len(closes), closes[-1])
         
-        return dates[-120:], closes[-120:]  # Return last 120 days
+        return dates, closes  # Last 120 days
         
     except Exception as e:
         if logger:
-            logger.warning(f"Stooq failed for {symbol}: {str(e)}")
+            logger.warning("Stooq failed for %s: %s", symbol, e)
         return [], []
 
 # ----------------------- Headlines (NewsAPI / Yahoo / CoinGecko) -----------------------
 
-def _news_headline_via_newsapi(symbol: str, name: str, logger=None) -> Optional[Dict[str, Any]]:
-    if not NEWSAPI_KEY:
-        if logger:
-            logger.warning("NewsAPI key not configured")
-        return None
+def _newsapi_everything(q: str, page_size: int, label: str, logger=None) -> Optional[List[Dict[str, Any]]]:
+    """Articles for a NewsAPI /everything query (newest first), served from the disk cache when fresh."""
+    # Encode q: names like "S&P 500 Index" would otherwise split the query string
+    qs = urlencode({"q": q, "pageSize": page_size, "sortBy": "publishedAt", "language": "en", "apiKey": NEWSAPI_KEY})
+    url = f"https://newsapi.org/v2/everything?{qs}"
+    cache_name = _news_cache_name(f"{q}|{page_size}")
+    data = _cache_load(cache_name, NEWS_CACHE_TTL)
     
-    try:
-        # Try both symbol and company name
-        q = f'"{symbol}" OR "{name}"'
-        url = f"https://newsapi.org/v2/everything?q={q}&pageSize=5&sortBy=publishedAt&language=en&apiKey={NEWSAPI_KEY}"
-        
+    if data is not None:
         if logger:
-            logger.info(f"Fetching news for {symbol} from NewsAPI")
+            logger.info("NewsAPI cache hit for %s", label)
+    else:
+        if logger:
+            logger.info("Fetching news for %s from NewsAPI", label)
         
         data = _http_get_json(url, timeout=20.0, logger=logger)
         
         if not data:
             if logger:
-                logger.warning(f"NewsAPI returned no data for {symbol}")
+                logger.warning("NewsAPI returned no data for %s", label)
             return None
             
         if data.get("status") != "ok":
             if logger:
-                logger.warning(f"NewsAPI error for {symbol}: {data.get('message', 'unknown error')}")
+                logger.warning("NewsAPI error for %s: %s", label, data.get('message', 'unknown error'))
             return None
         
-        arts = data.get("articles") or []
-        
+        # Only successful responses are cached; errors and rate limits retry next run
+        _cache_store(cache_name, data)
+    
+    arts = data.get("articles") or []
+    
+    if logger:
+        logger.info("NewsAPI returned %s articles for %s", len(arts), label)
+    
+    return arts
+
+def _newsapi_item(art: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    title = (art.get("title") or "").strip()
+    if not title or "[Removed]" in title:
+        return None
+    return {
+        "title": title,
+        "when": art.get("publishedAt"),
+        "source": (art.get("source") or {}).get("name"),
+        "url": art.get("url"),
+        "description": art.get("description") or "",
+    }
+
+def _news_headline_via_newsapi(symbol: str, name: str, logger=None) -> Optional[Dict[str, Any]]:
+    if not NEWSAPI_KEY:
         if logger:
-            logger.info(f"NewsAPI returned {len(arts)} articles for {symbol}")
+            logger.warning("NewsAPI key not configured")
+        return None
+    
+    try:
+        # Try both symbol and company name
+        arts = _newsapi_everything(f'"{symbol}" OR "{name}"', 5, symbol, logger)
         
-        for art in arts:
-            title = (art.get("title") or "").strip()
-            if not title or "[Removed]" in title:
+        for art in arts or []:
+            item = _newsapi_item(art)
+            if item is None:
                 continue
-            when = art.get("publishedAt")
-            src = (art.get("source") or {}).get("name")
-            url = art.get("url")
-            desc = art.get("description") or ""
             
             if logger:
-                logger.info(f"Found news for {symbol}: {title[:50]}...")
+                logger.info("Found news for %s: %s...", symbol, item["title"][:50])
             
-            return {"title": title, "when": when, "source": src, "url": url, "description": desc}
+            return item
         
         return None
         
     except Exception as e:
         if logger:
-            logger.error(f"NewsAPI exception for {symbol}: {str(e)}")
+            logger.error("NewsAPI exception for %s: %s", symbol, e)
         return None
 
+def _newsapi_batch(terms: List[Tuple[str, str]], logger=None) -> Dict[str, Dict[str, Any]]:
+    """Headlines for many (symbol, name) pairs from a few OR-combined NewsAPI queries.
+    
+    Each article goes to the first pair whose symbol or name (as whole words) appears in
+    its title/description; pairs left unmatched fall back to per-asset queries.
+    """
+    found: Dict[str, Dict[str, Any]] = {}
+    if not NEWSAPI_KEY or not terms:
+        return found
+    
+    # Pack per-asset sub-queries into batches under NewsAPI's query length limit
+    batches: List[List[Tuple[str, str, str]]] = []
+    size = 0
+    for sym, name in terms:
+        sub = f'"{sym}" OR "{name}"'
+        if not batches or size + len(sub) + 4 > NEWSAPI_MAX_QUERY:
+            batches.append([])
+            size = 0
+        batches[-1].append((sym, name, sub))
+        size += len(sub) + 4
+    
+    for batch in batches:
+        try:
+            q = " OR ".join(sub for _, _, sub in batch)
+            arts = _newsapi_everything(q, NEWSAPI_BATCH_PAGE_SIZE, f"{len(batch)} assets", logger)
+            # Symbols like "^GSPC" or "BTC-USD" start/end with non-word chars, so \b won't do;
+            # names get the same boundaries so "Gold" doesn't match "Goldman"
+            matchers = [(sym, re.compile(r"(?<![A-Za-z0-9])" + re.escape(sym) + r"(?![A-Za-z0-9])"),
+                         re.compile(r"(?<![A-Za-z0-9])" + re.escape(name) + r"(?![A-Za-z0-9])", re.I))
+                        for sym, name, _ in batch]
+            for art in arts or []:
+                item = _newsapi_item(art)
+                if item is None:
+                    continue
+                text = f"{item['title']} {item['description']}"
+                for sym, sym_re, name_re in matchers:
+                    if sym not in found and (sym_re.search(text) or name_re.search(text)):
+                        found[sym] = item
+                        break
+        except Exception as e:
+            if logger:
+                logger.error("NewsAPI batch exception: %s", e)
+    
+    if logger:
+        logger.info("NewsAPI batch matched %s/%s assets", len(found), len(terms))
+    return found
+
+def _parse_yahoo_rss(raw: bytes, symbol: str, logger=None) -> Optional[Dict[str, Any]]:
+    """First titled entry among the feed's first 3 <item>s, or None."""
+    # Stream-parse the feed and stop after the first few <item>s; CDATA is handled by the parser
+    checked = 0
+    for _, item in ET.iterparse(io.BytesIO(raw), events=("end",)):
+        if item.tag != "item":
+            continue
+        checked += 1
+        title = (item.findtext("title") or "").strip()
+        
+        if title:
+            # Feeds often entity-escape inside CDATA as well
+            title = title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+            
+            url = item.findtext("link")
+            when = item.findtext("pubDate")
+            desc = item.findtext("description") or ""
+            desc = desc.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
+            
+            if logger:
+                logger.info("Yahoo RSS found for %s: %s...", symbol, title[:50])
+            
+            return {
+                "title": title,
+                "url": url,
+                "when": when,
+                "source": "Yahoo Finance",
+                "description": desc[:200] if desc else ""
+            }
+        
+        item.clear()
+        if checked == 3:  # Check first 3 items
+            break
+    
+    return None
+
 def _yahoo_rss_news(symbol: str, logger=None) -> Optional[Dict[str, Any]]:
     """Fallback: Get news from Yahoo Finance RSS (no API key needed)."""
     try:
         url = f"https://feeds.finance.yahoo.com/rss/2.0/headline?s={symbol}&region=US&lang=en-US"
         
         if logger:
-            logger.info(f"Trying Yahoo RSS for {symbol}")
-        
-        from urllib.request import urlopen, Request
-        req = Request(url, headers={"User-Agent": "Mozilla/5.0"})
-        with urlopen(req, timeout=10.0) as resp:
-            raw = resp.read().decode("utf-8", errors="replace")
-        
-        # Simple RSS parsing
-        import re
-        items = re.findall(r'<item>(.*?)</item>', raw, re.DOTALL)
-        
-        for item in items[:3]:  # Check first 3 items
-            title_match = re.search(r'<title>(.*?)</title>', item)
-            link_match = re.search(r'<link>(.*?)</link>', item)
-            pubdate_match = re.search(r'<pubDate>(.*?)</pubDate>', item)
-            desc_match = re.search(r'<description>(.*?)</description>', item)
-            
-            if title_match:
-                title = title_match.group(1).strip()
-                # Clean CDATA
-                title = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', title)
-                title = title.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-                
-                url = link_match.group(1) if link_match else None
-                when = pubdate_match.group(1) if pubdate_match else None
-                desc = desc_match.group(1) if desc_match else ""
-                desc = re.sub(r'<!\[CDATA\[(.*?)\]\]>', r'\1', desc)
-                desc = desc.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-                
-                if logger:
-                    logger.info(f"Yahoo RSS found for {symbol}: {title[:50]}...")
-                
-                return {
-                    "title": title,
-                    "url": url,
-                    "when": when,
-                    "source": "Yahoo Finance",
-                    "description": desc[:200] if desc else ""
-                }
-        
-        return None
+            logger.info("Trying Yahoo RSS for %s", symbol)
+        
+        cache_name = _rss_cache_name(symbol)
+        cached = _cache_load(cache_name, RSS_VALIDATOR_TTL)
+        headers = {"User-Agent": "Mozilla/5.0"}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        
+        raw, validators = _http_get_conditional(url, 10.0, headers)
+        if raw is None:
+            if logger:
+                logger.info("Yahoo RSS unchanged for %s (304), reusing cached entry", symbol)
+            return cached.get("item") if cached else None
+        
+        result = _parse_yahoo_rss(raw, symbol, logger)
+        if validators:
+            _cache_store(cache_name, {
+                "etag": validators.get("ETag"),
+                "last_modified": validators.get("Last-Modified"),
+                "item": result,
+            })
+        return result
         
     except Exception as e:
         if logger:
-            logger.warning(f"Yahoo RSS failed for {symbol}: {str(e)}")
+            logger.warning("Yahoo RSS failed for %s: %s", symbol, e)
         return None
 
 # ----------------------- Prices -----------------------
@@ -472,8 +802,12 @@ def _alpha_daily(symbol: str, logger=None) -> Tuple[List[str], List[float]]:
             logger.warning("Alpha Vantage API key not configured, trying yfinance")
         return _yfinance_daily(symbol, logger)
     
+    if not _ALPHA_LIMITER.acquire(ALPHA_MAX_WAIT):
+        if logger:
+            logger.info("Alpha Vantage quota busy for %s, trying yfinance", symbol)
+        return _yfinance_daily(symbol, logger)
+    
     try:
-        from urllib.parse import urlencode
         qs = urlencode({
             "function": "TIME_SERIES_DAILY_ADJUSTED",
             "symbol": symbol,
@@ -483,30 +817,32 @@ def _alpha_daily(symbol: str, logger=None) -> Tuple[List[str], List[float]]:
         url = f"https://www.alphavantage.co/query?{qs}"
         
         if logger:
-            logger.info(f"Fetching prices for {symbol} from Alpha Vantage")
+            logger.info("Fetching prices for %s from Alpha Vantage", symbol)
         
         data = _http_get_json(url, timeout=30.0, logger=logger)
         
         if not data:
             if logger:
-                logger.warning(f"Alpha Vantage returned no data for {symbol}, trying yfinance")
+                logger.warning("Alpha Vantage returned no data for %s, trying yfinance", symbol)
             return _yfinance_daily(symbol, logger)
         
         # Check for rate limit or error
         if "Note" in data or "Information" in data:
+            # Further calls would get the same reply; send the other workers to yfinance meanwhile
+            _ALPHA_LIMITER.pause(ALPHA_COOLDOWN)
             if logger:
-                logger.warning(f"Alpha Vantage rate limit for {symbol}: {data.get('Note', data.get('Information', ''))}, trying yfinance")
+                logger.warning("Alpha Vantage rate limit for %s: %s, trying yfinance", symbol, data.get('Note', data.get('Information', '')))
             return _yfinance_daily(symbol, logger)
         
         if "Error Message" in data:
             if logger:
-                logger.warning(f"Alpha Vantage error for {symbol}: {data.get('Error Message', '')}, trying yfinance")
+                logger.warning("Alpha Vantage error for %s: %s, trying yfinance", symbol, data.get('Error Message', ''))
             return _yfinance_daily(symbol, logger)
         
         ts = data.get("Time Series (Daily)")
         if not isinstance(ts, dict):
             if logger:
-                logger.warning(f"Alpha Vantage unexpected format for {symbol}, trying yfinance")
+                logger.warning("Alpha Vantage unexpected format for %s, trying yfinance", symbol)
             return _yfinance_daily(symbol, logger)
         
         keys = sorted(ts.keys())
@@ -520,24 +856,48 @@ def _alpha_daily(symbol: str, logger=None) -> Tuple[List[str], List[float]]:
                 price = float(str(ac).replace(",", ""))
                 dates.append(k)
                 closes.append(price)
-            except Exception:
+            except ValueError:
                 continue
         
         if logger and len(closes) > 0:
-            logger.info(f"Alpha Vantage success for {symbol}: {len(closes)} prices, latest=${closes[-1]:.2f}")
+            logger.info("Alpha Vantage success for %s: %s prices, latest=$%.2f", symbol, len(closes), closes[-1])
         
         if not closes:
             if logger:
-                logger.warning(f"Alpha Vantage parsed no prices for {symbol}, trying yfinance")
+                logger.warning("Alpha Vantage parsed no prices for %s, trying yfinance", symbol)
             return _yfinance_daily(symbol, logger)
         
         return dates, closes
         
     except Exception as e:
         if logger:
-            logger.error(f"Alpha Vantage exception for {symbol}: {str(e)}, trying yfinance")
+            logger.error("Alpha Vantage exception for %s: %s, trying yfinance", symbol, e)
         return _yfinance_daily(symbol, logger)
 
+def _price_cache_fresh(symbol: str) -> bool:
+    """True when _daily_history would serve symbol from the disk cache."""
+    cached = _cache_load(_price_cache_name(symbol), PRICE_CACHE_TTL)
+    return bool(cached and cached.get("closes"))
+
+def _daily_history(symbol: str, logger=None) -> Tuple[List[str], List[float]]:
+    """Daily prices via Alpha Vantage/yfinance, then Stooq, with an on-disk TTL cache."""
+    name = _price_cache_name(symbol)
+    cached = _cache_load(name, PRICE_CACHE_TTL)
+    if cached and cached.get("closes"):
+        if logger:
+            logger.info("Price cache hit for %s: %s prices", symbol, len(cached['closes']))
+        return cached["dates"], cached["closes"]
+    
+    dt, cl = _alpha_daily(symbol, logger)
+    
+    # If still no data, try Stooq as last resort
+    if not cl:
+        dt, cl = _stooq_daily(symbol, logger)
+    
+    if cl:
+        _cache_store(name, {"dates": dt, "closes": cl})
+    return dt, cl
+
 def _coingecko_price(symbol: str, id_hint: Optional[str], logger=None) -> Optional[Dict[str, Any]]:
     """Enhanced CoinGecko price call with YTD calculation fallback."""
     try:
@@ -545,19 +905,20 @@ def _coingecko_price(symbol: str, id_hint: Optional[str], logger=None) -> Option
             id_hint = COINGECKO_IDS.get(symbol)
         if not id_hint:
             if logger:
-                logger.warning(f"No CoinGecko ID for {symbol}")
+                logger.warning("No CoinGecko ID for %s", symbol)
             return None
         
         url = f"https://api.coingecko.com/api/v3/coins/{id_hint}?localization=false&tickers=false&market_data=true&community_data=false&developer_data=false&sparkline=false"
         
         if logger:
-            logger.info(f"Fetching crypto data for {symbol} from CoinGecko")
+            logger.info("Fetching crypto data for %s from CoinGecko", symbol)
         
+        _COINGECKO_LIMITER.acquire()
         data = _http_get_json(url, timeout=20.0, logger=logger)
         
         if not data:
             if logger:
-                logger.warning(f"CoinGecko returned no data for {symbol}")
+                logger.warning("CoinGecko returned no data for %s", symbol)
             return None
         
         m = data.get("market_data") or {}
@@ -576,30 +937,34 @@ def _coingecko_price(symbol: str, id_hint: Optional[str], logger=None) -> Option
                 hist_url = f"https://api.coingecko.com/api/v3/coins/{id_hint}/history?date={jan1}&localization=false"
                 
                 if logger:
-                    logger.info(f"Fetching YTD baseline for {symbol} from CoinGecko history")
+                    logger.info("Fetching YTD baseline for %s from CoinGecko history", symbol)
                 
+                _COINGECKO_LIMITER.acquire()
                 hist_data = _http_get_json(hist_url, timeout=20.0, logger=logger)
                 if hist_data and "market_data" in hist_data:
                     jan1_price = (hist_data["market_data"].get("current_price") or {}).get("usd")
                     if jan1_price and price:
                         pct_ytd = ((price / jan1_price) - 1) * 100
                         if logger:
-                            logger.info(f"Calculated YTD for {symbol}: {pct_ytd:.1f}%")
+                            logger.info("Calculated YTD for %s: %.1f%%", symbol, pct_ytd)
             except Exception as e:
                 if logger:
-                    logger.warning(f"Failed to calculate YTD for {symbol}: {e}")
+                    logger.warning("Failed to calculate YTD for %s: %s", symbol, e)
         
         low_52w = (m.get("low_52w") or {}).get("usd")  # may be missing
         high_52w = (m.get("high_52w") or {}).get("usd")
         
         if logger and price:
-            logger.info(f"CoinGecko success for {symbol}: price=${price:.2f}, 1d={pct_1d:.1f}%, YTD={pct_ytd:.1f}%" if pct_ytd else f"CoinGecko success for {symbol}: price=${price:.2f}, 1d={pct_1d:.1f}%")
+            if pct_ytd:
+                logger.info("CoinGecko success for %s: price=$%.2f, 1d=%.1f%%, YTD=%.1f%%", symbol, price, pct_1d, pct_ytd)
+            else:
+                logger.info("CoinGecko success for %s: price=$%.2f, 1d=%.1f%%", symbol, price, pct_1d)
         
         return {"price": price, "pct_1d": pct_1d, "pct_1w": pct_1w, "pct_1m": pct_1m, "pct_ytd": pct_ytd,
                 "low_52w": low_52w, "high_52w": high_52w}
     except Exception as e:
         if logger:
-            logger.error(f"CoinGecko exception for {symbol}: {str(e)}")
+            logger.error("CoinGecko exception for %s: %s", symbol, e)
         return None
 
 # ----------------------- Hero Scoring -----------------------
@@ -617,27 +982,23 @@ _BACKUP_KWS = {
     "sector": ["tech", "ai", "crypto", "energy", "healthcare", "semiconductor", "bitcoin", "ethereum"],
 }
 
+# Flattened (keyword, weight) pairs so scoring is one pass of C-level substring checks
+_BREAKING_WEIGHTS = {"urgent": 25, "major": 20, "earnings": 18, "deal": 18, "reg": 15}
+_BACKUP_WEIGHTS = {"analysis": 8, "market": 10, "sector": 9}
+_BREAKING_SCORED = tuple((kw, _BREAKING_WEIGHTS[g]) for g, kws in _BREAKING_KWS.items() for kw in kws)
+_BACKUP_SCORED = tuple((kw, _BACKUP_WEIGHTS[g]) for g, kws in _BACKUP_KWS.items() for kw in kws)
+
 def _score_headline(headline: str, published: Optional[datetime]) -> Tuple[int, int]:
     bl = headline.lower()
     breaking, backup = 0, 0
     
     # Check breaking keywords
-    for kw in _BREAKING_KWS["urgent"]:   
-        if kw in bl: breaking += 25
-    for kw in _BREAKING_KWS["major"]:    
-        if kw in bl: breaking += 20
-    for kw in _BREAKING_KWS["earnings"]: 
-        if kw in bl: breaking += 18
-    for kw in _BREAKING_KWS["deal"]:     
-        if kw in bl: breaking += 18
-    for kw in _BREAKING_KWS["reg"]:      
-        if kw in bl: breaking += 15
+    for kw, weight in _BREAKING_SCORED:
+        if kw in bl: breaking += weight
     
     # Check backup keywords
-    for group, kws in _BACKUP_KWS.items():
-        for kw in kws:
-            if kw in bl:
-                backup += 8 if group == "analysis" else 10 if group == "market" else 9
+    for kw, weight in _BACKUP_SCORED:
+        if kw in bl: backup += weight
     
     # Recency boost
     if published:
@@ -655,8 +1016,8 @@ def _score_headline(headline: str, published: Optional[datetime]) -> Tuple[int,
             elif hours_ago < 24:
                 breaking += 5
                 backup += 5
-        except:
-            pass
+        except TypeError:
+            pass  # naive vs aware datetime; no recency boost
     
     # Ensure any article with keywords gets at least some score
     if breaking == 0 and backup > 0:
@@ -761,18 +1122,210 @@ def _calculate_momentum(prices: List[float], volumes: List[float] = None) -> Dic
     
     return indicators
 
+# ----------------------- Market data (per asset) -----------------------
+
+def _first_index_of_year(dates: List[str], year: int) -> Optional[int]:
+    """Index of the first trading day of year in ascending YYYY-MM-DD dates (binary search)."""
+    idx = bisect_left(dates, f"{year:04d}-01-01")
+    if idx < len(dates) and dates[idx].startswith(f"{year:04d}-"):
+        return idx
+    return None
+
+def _range_52w(closes: List[float]) -> Tuple[Optional[float], Optional[float]]:
+    """(low, high) over the last 252 closes (or all of them if fewer), from a single slice."""
+    window = closes[-252:]
+    if not window:
+        return None, None
+    return min(window), max(window)
+
+def _asset_headline(a: Dict[str, Any], engine_news: Dict[str, Dict[str, Any]],
+                    newsapi_batch: Dict[str, Dict[str, Any]], logger) -> Optional[Dict[str, Any]]:
+    """Pick one headline for an asset: commodity news, then engine, NewsAPI, Yahoo RSS (blocking I/O)."""
+    sym = a["symbol"]
+    
+    # For commodities, try to get commodity-specific news
+    if a["category"] == "commodity" and sym in COMMODITY_MAP:
+        commodity_name = COMMODITY_MAP[sym]["name"]
+        # Try news for the actual commodity
+        r = (newsapi_batch.get(commodity_name) or _news_headline_via_newsapi(commodity_name, commodity_name, logger)) if NEWSAPI_KEY else None
+        if r and r.get("title"):
+            logger.info("  Using commodity news for %s", commodity_name)
+            return r
+    
+    # Standard news fetching
+    m = engine_news.get(sym)
+    if m and m.get("title"):
+        logger.info("  Using engine news for %s", sym)
+        return m
+    
+    # Try NewsAPI first
+    if NEWSAPI_KEY:
+        r = newsapi_batch.get(sym) or _news_headline_via_newsapi(sym, a["name"], logger)
+        if r and r.get("title"):
+            logger.info("  Using NewsAPI news for %s", sym)
+            return r
+    
+    # Fallback to Yahoo RSS if no NewsAPI result
+    r = _yahoo_rss_news(sym, logger)
+    if r and r.get("title"):
+        logger.info("  Using Yahoo RSS news for %s", sym)
+        return r
+    return None
+
+@dataclass(slots=True)
+class MarketSnapshot:
+    """Price, change and momentum fields fetched for one watchlist asset."""
+    price: Optional[float] = None
+    pct_1d: Optional[float] = None
+    pct_1w: Optional[float] = None
+    pct_1m: Optional[float] = None
+    pct_ytd: Optional[float] = None
+    low_52w: Optional[float] = None
+    high_52w: Optional[float] = None
+    commodity_unit: Optional[str] = None
+    commodity_display_name: Optional[str] = None
+    momentum: Dict[str, Any] = field(default_factory=dict)
+    failed: bool = False
+
+def _fetch_market_data(a: Dict[str, Any], commodity_prices: Dict[str, Dict[str, Any]], logger) -> MarketSnapshot:
+    """Fetch price, change and momentum fields for one watchlist asset (blocking I/O)."""
+    sym = a["symbol"]
+    cat = a["category"]
+    failed = False
+    
+    price = None; pct_1d = pct_1w = pct_1m = pct_ytd = None
+    low_52w = high_52w = None
+    commodity_unit = None
+    commodity_display_name = None
+    momentum_data = {}  # Initialize momentum data
+
+    if cat == "commodity" and sym in COMMODITY_MAP:
+        # Use actual commodity prices
+        commodity_key = COMMODITY_MAP[sym]["symbol"]
+        commodity_data = commodity_prices.get(commodity_key, {})
+
+        if commodity_data:
+            price = commodity_data.get("price")
+            pct_1d = commodity_data.get("pct_1d")
+            pct_1w = commodity_data.get("pct_1w")
+            pct_1m = commodity_data.get("pct_1m")
+            pct_ytd = commodity_data.get("pct_ytd")
+            low_52w = commodity_data.get("low_52w")
+            high_52w = commodity_data.get("high_52w")
+            commodity_unit = commodity_data.get("unit", COMMODITY_MAP[sym]["unit"])
+            commodity_display_name = COMMODITY_MAP[sym]["name"]
+
+            # Commodity momentum would need historical data
+            momentum_data = {}
+
+            if price and pct_1d is not None:
+                logger.info("  Using commodity price for %s: $%.2f/%s, 1D=%.1f%%, 1W=%.1f%%, 1M=%.1f%%, YTD=%.1f%%",
+                            commodity_display_name, price, commodity_unit, pct_1d, pct_1w, pct_1m, pct_ytd)
+            else:
+                logger.info("  No commodity price for %s", commodity_display_name)
+        else:
+            # Fallback to ETF price if commodity price not available
+            dt, cl = _daily_history(sym, logger)
+
+            if cl:
+                price = cl[-1]
+                # Calculate percentages for ETF fallback
+                if len(cl) >= 2: 
+                    pct_1d = ((cl[-1]/cl[-2])-1.0)*100.0
+                if len(cl) >= 6: 
+                    pct_1w = ((cl[-1]/cl[-6])-1.0)*100.0
+                if len(cl) >= 22: 
+                    pct_1m = ((cl[-1]/cl[-22])-1.0)*100.0
+
+                # FIXED YTD calculation for ETF fallback
+                ytd_idx = _first_index_of_year(dt, datetime.now().year)
+
+                if ytd_idx is not None and ytd_idx < len(cl):
+                    pct_ytd = ((cl[-1]/cl[ytd_idx])-1.0)*100.0
+
+                # 52-week range
+                low_52w, high_52w = _range_52w(cl)
+
+                # Calculate momentum for ETF fallback
+                if len(cl) >= 2:
+                    momentum_data = _calculate_momentum(cl)
+
+                logger.info("  Fallback to ETF price for %s: $%.2f", sym, price)
+            else:
+                logger.warning("  No price data for commodity %s", sym)
+                failed = True
+
+    elif cat in ("equity", "etf_index"):
+        # Alpha Vantage first (with yfinance fallback), then Stooq; cached on disk
+        dt, cl = _daily_history(sym, logger)
+
+        if cl:
+            price = cl[-1]
+            if len(cl) >= 2: 
+                pct_1d = ((cl[-1]/cl[-2])-1.0)*100.0
+            if len(cl) >= 6: 
+                pct_1w = ((cl[-1]/cl[-6])-1.0)*100.0
+            if len(cl) >= 22: 
+                pct_1m = ((cl[-1]/cl[-22])-1.0)*100.0
+
+            # FIXED YTD calculation
+            ytd_idx = _first_index_of_year(dt, datetime.now().year)
+
+            if ytd_idx is not None and ytd_idx < len(cl):
+                pct_ytd = ((cl[-1]/cl[ytd_idx])-1.0)*100.0
+            else:
+                # If we don't have data from the start of the year, use the oldest available
+                if cl and len(cl) > 1:
+                    pct_ytd = ((cl[-1]/cl[0])-1.0)*100.0
+
+            # Calculate 52-week range
+            low_52w, high_52w = _range_52w(cl)
+
+            # Calculate momentum for equity/ETF
+            if len(cl) >= 2:
+                momentum_data = _calculate_momentum(cl)
+
+            if pct_1d and pct_ytd:
+                logger.info("  Price data for %s: $%.2f, 1d=%.1f%%, YTD=%.1f%%", sym, price, pct_1d, pct_ytd)
+            else:
+                logger.info("  Price data for %s: $%.2f", sym, price)
+        else:
+            logger.warning("  No price data for %s from any source", sym)
+            failed = True
+
+    elif cat == "crypto":
+        cg = _coingecko_price(sym, a.get("coingecko_id"), logger)
+        if cg and cg.get("price") is not None:
+            price = cg["price"]; pct_1d = cg.get("pct_1d"); pct_1w = cg.get("pct_1w"); 
+            pct_1m = cg.get("pct_1m"); pct_ytd = cg.get("pct_ytd")
+            low_52w = cg.get("low_52w"); high_52w = cg.get("high_52w")
+
+            # Crypto momentum would need historical data from separate API call
+            momentum_data = {}
+        else:
+            logger.warning("  No crypto data for %s", sym)
+            failed = True
+    
+    return MarketSnapshot(
+        price, pct_1d, pct_1w, pct_1m, pct_ytd, low_52w, high_52w,
+        commodity_unit, commodity_display_name, momentum_data, failed,
+    )
+
 # ----------------------- Main -----------------------
 
 async def build_nextgen_html(logger) -> str:
+    # One keep-alive session serves every fetch in the run; release its sockets when done
+    try:
+        return await _build_nextgen_html(logger)
+    finally:
+        _close_http_session()
+
+async def _build_nextgen_html(logger) -> str:
     logger.info("=== Starting NextGen digest build ===")
-    logger.info(f"Environment: NEWSAPI_KEY={'set' if NEWSAPI_KEY else 'not set'}, ALPHA_KEY={'set' if ALPHA_KEY else 'not set'}")
+    logger.info("Environment: NEWSAPI_KEY=%s, ALPHA_KEY=%s", 'set' if NEWSAPI_KEY else 'not set', 'set' if ALPHA_KEY else 'not set')
     
     assets = _load_watchlist()  # PRESERVES ORDER
-    logger.info(f"Loaded {len(assets)} assets from watchlist")
-    
-    # Fetch commodity prices once
-    commodity_prices = _fetch_commodity_prices(logger)
-    logger.info(f"Fetched {len(commodity_prices)} commodity prices")
+    logger.info("Loaded %s assets from watchlist", len(assets))
     
     up = down = 0
     failed = 0
@@ -781,28 +1334,76 @@ async def build_nextgen_html(logger) -> str:
     enriched: List[Dict[str, Any]] = []
 
     # Gather news map; use engine if available, else NewsAPI/Yahoo/CoinGecko when possible
-    engine_news: Dict[str, Dict[str, Any]] = {}
-    try:
-        from main import StrategicIntelligenceEngine  # optional
-        engine = StrategicIntelligenceEngine()
-        logger.info("NextGen: attempting news via engine")
-        news = await engine._synthesize_strategic_news()
-        # Expecting iterable of {symbol,title,url,when,source,description}
-        for item in news or []:
-            sym = str(item.get("symbol") or "").upper()
-            if not sym: 
-                continue
-            engine_news[sym] = {
-                "title": item.get("title"),
-                "url": item.get("url"),
-                "when": item.get("when"),
-                "source": item.get("source"),
-                "description": item.get("description"),
-            }
-        logger.info(f"Engine provided news for {len(engine_news)} symbols")
-    except Exception as e:
-        logger.info(f"Engine news not available (this is okay): {e}")
-        # Continue without engine news - we'll use NewsAPI/other sources
+    async def _engine_news() -> Dict[str, Dict[str, Any]]:
+        engine_news: Dict[str, Dict[str, Any]] = {}
+        try:
+            from main import StrategicIntelligenceEngine  # optional
+            engine = StrategicIntelligenceEngine()
+            logger.info("NextGen: attempting news via engine")
+            news = await engine._synthesize_strategic_news()
+            # Expecting iterable of {symbol,title,url,when,source,description}
+            for item in news or []:
+                sym = str(item.get("symbol") or "").upper()
+                if not sym: 
+                    continue
+                engine_news[sym] = {
+                    "title": item.get("title"),
+                    "url": item.get("url"),
+                    "when": item.get("when"),
+                    "source": item.get("source"),
+                    "description": item.get("description"),
+                }
+            logger.info("Engine provided news for %s symbols", len(engine_news))
+        except Exception as e:
+            logger.info("Engine news not available (this is okay): %s", e)
+            # Continue without engine news - we'll use NewsAPI/other sources
+        return engine_news
+
+    async def _yf_batch() -> None:
+        # Never serve closes batched by an earlier build in this process
+        _YF_BATCH.clear()
+        # Without Alpha Vantage every equity/index goes to yfinance; fetch them in one request
+        if not ALPHA_KEY:
+            _YF_BATCH.update(await asyncio.to_thread(
+                _yfinance_daily_many,
+                [a["symbol"] for a in assets if a["category"] in ("equity", "etf_index")
+                 and not _price_cache_fresh(a["symbol"])], logger))
+
+    # Market data is independent per asset; fetch it concurrently in worker threads
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def _prices() -> List[MarketSnapshot]:
+        # Commodity spot prices and the yfinance batch are independent; both feed the per-asset fetch
+        commodity_prices, _ = await asyncio.gather(
+            asyncio.to_thread(_fetch_commodity_prices, logger), _yf_batch())
+        logger.info("Fetched %s commodity prices", len(commodity_prices))
+
+        async def _market(a: Dict[str, Any]) -> MarketSnapshot:
+            async with sem:
+                return await asyncio.to_thread(_fetch_market_data, a, commodity_prices, logger)
+
+        return await asyncio.gather(*(_market(a) for a in assets))
+
+    # Engine news and the price pipeline hit different hosts; overlap them
+    engine_news, market_data = await asyncio.gather(_engine_news(), _prices())
+    logger.info("Fetched market data for %s assets", len(market_data))
+
+    # One OR-combined NewsAPI query per batch of assets instead of one request each
+    news_terms: List[Tuple[str, str]] = []
+    for a in assets:
+        if a["category"] == "commodity" and a["symbol"] in COMMODITY_MAP:
+            commodity_name = COMMODITY_MAP[a["symbol"]]["name"]
+            news_terms.append((commodity_name, commodity_name))
+        if a["symbol"] not in engine_news:
+            news_terms.append((a["symbol"], a["name"]))
+    newsapi_batch = await asyncio.to_thread(_newsapi_batch, news_terms, logger) if NEWSAPI_KEY else {}
+
+    # Per-asset fallbacks (single NewsAPI queries, Yahoo RSS) are independent; fan them out too
+    async def _headline(a: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        async with sem:
+            return await asyncio.to_thread(_asset_headline, a, engine_news, newsapi_batch, logger)
+
+    headlines = await asyncio.gather(*(_headline(a) for a in assets))
 
     seven_days_ago = datetime.now(timezone.utc) - timedelta(days=7)
     
@@ -811,196 +1412,33 @@ async def build_nextgen_html(logger) -> str:
 
     for i, a in enumerate(assets):
         sym = a["symbol"]
-        name = a["name"]
         cat  = a["category"]
         
-        logger.info(f"Processing {i+1}/{len(assets)}: {sym} ({cat})")
+        logger.info("Processing %s/%s: %s (%s)", i+1, len(assets), sym, cat)
 
-        # --------- Headline (prefer engine; otherwise NewsAPI/Yahoo) ----------
+        # --------- Headline (fetched concurrently above) ----------
         headline = None; h_url = None; h_source = None; h_when = None; desc = ""
-        
-        # For commodities, try to get commodity-specific news
-        if cat == "commodity" and sym in COMMODITY_MAP:
-            commodity_name = COMMODITY_MAP[sym]["name"]
-            # Try news for the actual commodity
-            r = _news_headline_via_newsapi(commodity_name, commodity_name, logger) if NEWSAPI_KEY else None
-            if r and r.get("title"):
-                headline = r["title"]; h_url = r.get("url"); h_source = r.get("source")
-                h_when = r.get("when"); desc = r.get("description") or ""
-                logger.info(f"  Using commodity news for {commodity_name}")
-        
-        # Standard news fetching
-        if not headline:
-            m = engine_news.get(sym)
-            if m and m.get("title"):
-                headline = m["title"]; h_url = m.get("url"); h_source = m.get("source")
-                h_when = m.get("when"); desc = m.get("description") or ""
-                logger.info(f"  Using engine news for {sym}")
-            else:
-                # Try NewsAPI first
-                if NEWSAPI_KEY:
-                    r = _news_headline_via_newsapi(sym, name, logger)
-                    if r and r.get("title"):
-                        headline = r["title"]; h_url = r.get("url"); h_source = r.get("source"); 
-                        h_when = r.get("when"); desc = r.get("description") or ""
-                        logger.info(f"  Using NewsAPI news for {sym}")
-                
-                # Fallback to Yahoo RSS if no NewsAPI result
-                if not headline:
-                    r = _yahoo_rss_news(sym, logger)
-                    if r and r.get("title"):
-                        headline = r["title"]; h_url = r.get("url"); h_source = r.get("source")
-                        h_when = r.get("when"); desc = r.get("description") or ""
-                        logger.info(f"  Using Yahoo RSS news for {sym}")
-
-        # Enforce 7-day cutoff on articles (skip if older)
-        if h_when:
-            pub_dt = _parse_iso(h_when)
-            if pub_dt and pub_dt < seven_days_ago:
-                logger.info(f"  News for {sym} is too old (>7 days), skipping")
-                headline = None; h_url = None; h_source = None; h_when = None; desc = ""
-
-        # --------- Pricing ----------
-        price = None; pct_1d = pct_1w = pct_1m = pct_ytd = None
-        low_52w = high_52w = None
-        commodity_unit = None
-        commodity_display_name = None
-        momentum_data = {}  # Initialize momentum data
-        
-        if cat == "commodity" and sym in COMMODITY_MAP:
-            # Use actual commodity prices
-            commodity_key = COMMODITY_MAP[sym]["symbol"]
-            commodity_data = commodity_prices.get(commodity_key, {})
-            
-            if commodity_data:
-                price = commodity_data.get("price")
-                pct_1d = commodity_data.get("pct_1d")
-                pct_1w = commodity_data.get("pct_1w")
-                pct_1m = commodity_data.get("pct_1m")
-                pct_ytd = commodity_data.get("pct_ytd")
-                low_52w = commodity_data.get("low_52w")
-                high_52w = commodity_data.get("high_52w")
-                commodity_unit = commodity_data.get("unit", COMMODITY_MAP[sym]["unit"])
-                commodity_display_name = COMMODITY_MAP[sym]["name"]
-                
-                # Commodity momentum would need historical data
-                momentum_data = {}
-                
-                logger.info(f"  Using commodity price for {commodity_display_name}: ${price:.2f}/{commodity_unit}, 1D={pct_1d:.1f}%, 1W={pct_1w:.1f}%, 1M={pct_1m:.1f}%, YTD={pct_ytd:.1f}%" if price and pct_1d is not None else f"  No commodity price for {commodity_display_name}")
-            else:
-                # Fallback to ETF price if commodity price not available
-                dt, cl = _alpha_daily(sym, logger)
-                if not cl:
-                    dt, cl = _stooq_daily(sym, logger)
-                
-                if cl:
-                    price = cl[-1]
-                    # Calculate percentages for ETF fallback
-                    if len(cl) >= 2: 
-                        pct_1d = ((cl[-1]/cl[-2])-1.0)*100.0
-                    if len(cl) >= 6: 
-                        pct_1w = ((cl[-1]/cl[-6])-1.0)*100.0
-                    if len(cl) >= 22: 
-                        pct_1m = ((cl[-1]/cl[-22])-1.0)*100.0
-                    
-                    # FIXED YTD calculation for ETF fallback
-                    current_year = datetime.now().year
-                    current_date = datetime.now()
-                    
-                    # Find the index for the first trading day of the year
-                    ytd_idx = None
-                    for idx, date_str in enumerate(dt):
-                        try:
-                            date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                            if date_obj.year == current_year:
-                                ytd_idx = idx
-                                break
-                        except:
-                            continue
-                    
-                    if ytd_idx is not None and ytd_idx < len(cl):
-                        pct_ytd = ((cl[-1]/cl[ytd_idx])-1.0)*100.0
-                    
-                    # 52-week range
-                    if len(cl) >= 252:
-                        low_52w, high_52w = min(cl[-252:]), max(cl[-252:])
-                    elif cl:
-                        low_52w, high_52w = min(cl), max(cl)
-                    
-                    # Calculate momentum for ETF fallback
-                    if len(cl) >= 2:
-                        momentum_data = _calculate_momentum(cl)
-                    
-                    logger.info(f"  Fallback to ETF price for {sym}: ${price:.2f}")
-                else:
-                    logger.warning(f"  No price data for commodity {sym}")
-                    failed += 1
-                
-        elif cat in ("equity", "etf_index"):
-            # Try Alpha Vantage first (with yfinance fallback)
-            dt, cl = _alpha_daily(sym, logger)
-            
-            # If still no data, try Stooq as last resort
-            if not cl:
-                dt, cl = _stooq_daily(sym, logger)
-            
-            if cl:
-                price = cl[-1]
-                if len(cl) >= 2: 
-                    pct_1d = ((cl[-1]/cl[-2])-1.0)*100.0
-                if len(cl) >= 6: 
-                    pct_1w = ((cl[-1]/cl[-6])-1.0)*100.0
-                if len(cl) >= 22: 
-                    pct_1m = ((cl[-1]/cl[-22])-1.0)*100.0
-                
-                # FIXED YTD calculation
-                current_year = datetime.now().year
-                
-                # Find the index for the first trading day of the year
-                ytd_idx = None
-                for idx, date_str in enumerate(dt):
-                    try:
-                        date_obj = datetime.strptime(date_str, "%Y-%m-%d")
-                        if date_obj.year == current_year:
-                            ytd_idx = idx
-                            break
-                    except:
-                        continue
-                
-                if ytd_idx is not None and ytd_idx < len(cl):
-                    pct_ytd = ((cl[-1]/cl[ytd_idx])-1.0)*100.0
-                else:
-                    # If we don't have data from the start of the year, use the oldest available
-                    if cl and len(cl) > 1:
-                        pct_ytd = ((cl[-1]/cl[0])-1.0)*100.0
-                
-                # Calculate 52-week range
-                if len(cl) >= 252:
-                    low_52w, high_52w = min(cl[-252:]), max(cl[-252:])
-                elif cl:
-                    low_52w, high_52w = min(cl), max(cl)
-                
-                # Calculate momentum for equity/ETF
-                if len(cl) >= 2:
-                    momentum_data = _calculate_momentum(cl)
-                
-                logger.info(f"  Price data for {sym}: ${price:.2f}, 1d={pct_1d:.1f}%, YTD={pct_ytd:.1f}%" if pct_1d and pct_ytd else f"  Price data for {sym}: ${price:.2f}")
-            else:
-                logger.warning(f"  No price data for {sym} from any source")
-                failed += 1
-                
-        elif cat == "crypto":
-            cg = _coingecko_price(sym, a.get("coingecko_id"), logger)
-            if cg and cg.get("price") is not None:
-                price = cg["price"]; pct_1d = cg.get("pct_1d"); pct_1w = cg.get("pct_1w"); 
-                pct_1m = cg.get("pct_1m"); pct_ytd = cg.get("pct_ytd")
-                low_52w = cg.get("low_52w"); high_52w = cg.get("high_52w")
-                
-                # Crypto momentum would need historical data from separate API call
-                momentum_data = {}
-            else:
-                logger.warning(f"  No crypto data for {sym}")
-                failed += 1
+        r = headlines[i]
+        if r:
+            headline = r["title"]; h_url = r.get("url"); h_source = r.get("source")
+            h_when = r.get("when"); desc = r.get("description") or ""
+
+        # Enforce 7-day cutoff on articles (skip if older); the parsed date is kept for scoring
+        pub_dt = _parse_iso(h_when) if h_when else None
+        if pub_dt and pub_dt < seven_days_ago:
+            logger.info("  News for %s is too old (>7 days), skipping", sym)
+            headline = None; h_url = None; h_source = None; h_when = None; desc = ""
+
+        # --------- Pricing (fetched concurrently above) ----------
+        md = market_data[i]
+        price = md.price
+        pct_1d, pct_1w, pct_1m, pct_ytd = md.pct_1d, md.pct_1w, md.pct_1m, md.pct_ytd
+        low_52w, high_52w = md.low_52w, md.high_52w
+        commodity_unit = md.commodity_unit
+        commodity_display_name = md.commodity_display_name
+        momentum_data = md.momentum
+        if md.failed:
+            failed += 1
 
         if pct_1d is not None:
             if pct_1d >= 0: up += 1
@@ -1034,11 +1472,12 @@ async def build_nextgen_html(logger) -> str:
                 "when": h_when,
                 "description": desc,
                 "category": cat,
-                "symbol": sym
+                "symbol": sym,
+                "published": pub_dt,
             })
 
-    logger.info(f"=== Data collection complete: {len(enriched)} assets, {up} up, {down} down, {failed} failed ===")
-    logger.info(f"=== Total news items collected: {len(all_news_items)} ===")
+    logger.info("=== Data collection complete: %s assets, %s up, %s down, %s failed ===", len(enriched), up, down, failed)
+    logger.info("=== Total news items collected: %s ===", len(all_news_items))
 
     # ----------------- Build hero lists -----------------
 
@@ -1050,7 +1489,7 @@ async def build_nextgen_html(logger) -> str:
 
     for item in all_news_items:
         title = item["title"]
-        pub = _parse_iso(item["when"]) if item["when"] else None
+        pub = item["published"]
         
         # Skip old articles
         if pub and pub < seven_days_ago:
@@ -1058,7 +1497,7 @@ async def build_nextgen_html(logger) -> str:
         
         b_score, g_score = _score_headline(title, pub)
         
-        logger.info(f"  Scored '{title[:50]}...': breaking={b_score}, general={g_score}")
+        logger.info("  Scored '%s...': breaking=%s, general=%s", title[:50], b_score, g_score)
         
         # Lower threshold to 10 for breaking news to ensure we get some
         if b_score > 10:
@@ -1083,13 +1522,13 @@ async def build_nextgen_html(logger) -> str:
             "when": item["when"],
             "description": item["description"],
         })
-        logger.info(f"Selected breaking news (score={score}): {item['title'][:50]}...")
+        logger.info("Selected breaking news (score=%s): %s...", score, item['title'][:50])
     
     if not heroes_breaking and all_news_items:
         # If no breaking news qualified, take the 2 most recent articles
         logger.info("No breaking news found, using most recent articles instead")
         sorted_by_date = sorted(all_news_items, 
-                               key=lambda x: _parse_iso(x["when"]) if x["when"] else datetime.min.replace(tzinfo=timezone.utc), 
+                               key=lambda x: x["published"] or datetime.min.replace(tzinfo=timezone.utc), 
                                reverse=True)
         for item in sorted_by_date[:2]:
             heroes_breaking.append({
@@ -1099,9 +1538,9 @@ async def build_nextgen_html(logger) -> str:
                 "when": item["when"],
                 "description": item["description"],
             })
-            logger.info(f"Selected recent news: {item['title'][:50]}...")
+            logger.info("Selected recent news: %s...", item['title'][:50])
     
-    logger.info(f"Final breaking news count: {len(heroes_breaking)}")
+    logger.info("Final breaking news count: %s", len(heroes_breaking))
 
     # Select section heroes
     heroes_by_section: Dict[str, List[Dict[str, Any]]] = {}
@@ -1130,11 +1569,11 @@ async def build_nextgen_html(logger) -> str:
                 "when": item["when"],
                 "description": item["description"],
             })
-            logger.info(f"Selected {sec} hero (score={score}): {t[:50]}...")
+            logger.info("Selected %s hero (score=%s): %s...", sec, score, t[:50])
         
         if chosen:
             heroes_by_section[sec] = chosen
-            logger.info(f"Final {sec} hero count: {len(chosen)}")
+            logger.info("Final %s hero count: %s", sec, len(chosen))
 
     # ----------------- Summary + render -----------------
 
@@ -1151,12 +1590,12 @@ async def build_nextgen_html(logger) -> str:
         },
     }
 
-    logger.info(f"=== Summary prepared ===")
-    logger.info(f"  Breaking heroes: {len(heroes_breaking)}")
-    logger.info(f"  Section heroes: {sum(len(v) for v in heroes_by_section.values())} total")
+    logger.info("=== Summary prepared ===")
+    logger.info("  Breaking heroes: %s", len(heroes_breaking))
+    logger.info("  Section heroes: %s total", sum(len(v) for v in heroes_by_section.values()))
     
     logger.info("=== Rendering email HTML ===")
     html = render_email(summary, enriched)
-    logger.info(f"=== HTML generated: {len(html)} characters ===")
+    logger.info("=== HTML generated: %s characters ===", len(html))
     
     return html
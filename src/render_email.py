@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone, timedelta
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from html import escape
 from typing import Dict, List, Optional, Any, Iterable
 
@@ -12,6 +14,8 @@ except Exception:
 # Use Central Time for "As of" timestamp
 CENTRAL_TZ = ZoneInfo("America/Chicago") if ZoneInfo else None
 
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]\s+')
+
 # ---------------------------------------------------------------------------
 # Helpers for parsing and formatting dates
 # ---------------------------------------------------------------------------
@@ -45,7 +49,6 @@ def _parse_to_dt(value: Any) -> Optional[datetime]:
         pass
     # RFC 2822
     try:
-        from email.utils import parsedate_to_datetime
         dt = parsedate_to_datetime(s)
         if dt and dt.tzinfo is None:
             dt = dt.replace(tzinfo=timezone.utc)
@@ -91,29 +94,48 @@ def _safe_float(x: Any, default: Optional[float] = None) -> Optional[float]:
         if v != v or abs(v) > 1e10:
             return default
         return v
-    except Exception:
+    except (TypeError, ValueError, OverflowError):
         return default
 
 
+# Chip colors and arrow keyed by direction: None (no data), True (up/flat), False (down)
+_CHIP_STYLES = {
+    None: ('#6B7280', '#FFFFFF', ''),
+    True: ('#10B981', '#FFFFFF', '▲'),
+    False: ('#EF4444', '#FFFFFF', '▼'),
+}
+# Opening <span> for each direction, built once; only label and value vary per chip
+_CHIP_OPEN = {
+    key: (
+        '<span style="background:' + bg + ';color:' + color + ';padding:4px 8px;'
+        'border-radius:10px;font-size:12px;font-weight:700;display:inline-block;'
+        'margin:2px 3px;white-space:nowrap;width:70px;text-align:center;'
+        'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;">', sign
+    )
+    for key, (bg, color, sign) in _CHIP_STYLES.items()
+}
+_PILL_OPEN = {
+    key: (
+        '<span style="background:' + bg + ';color:' + color + ';padding:3px 7px;'
+        'border-radius:8px;font-size:11px;font-weight:600;display:inline-block;'
+        'margin:2px;white-space:nowrap;'
+        'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;">', sign
+    )
+    for key, (bg, color, sign) in _CHIP_STYLES.items()
+}
+
+
 def _chip(label: str, value: Any) -> str:
     """Render a colored chip for a change percentage or value - MODERATE PADDING."""
     v = _safe_float(value, None)
     if v is None:
-        bg, color, sign, txt = '#6B7280', '#FFFFFF', '', '--'
+        open_tag, sign = _CHIP_OPEN[None]
+        txt = '--'
     else:
-        if v >= 0:
-            bg, color, sign = '#10B981', '#FFFFFF', '▲'
-        else:
-            bg, color, sign = '#EF4444', '#FFFFFF', '▼'
+        open_tag, sign = _CHIP_OPEN[v >= 0]
         txt = f'{abs(v):.1f}%'
     # Moderate padding for good readability
-    return (
-        '<span style="background:' + bg + ';color:' + color + ';padding:4px 8px;'
-        'border-radius:10px;font-size:12px;font-weight:700;display:inline-block;'
-        'margin:2px 3px;white-space:nowrap;width:70px;text-align:center;'
-        'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;">'
-        + escape(label) + ' ' + sign + txt + '</span>'
-    )
+    return open_tag + escape(label) + ' ' + sign + txt + '</span>'
 
 
 def _chip_row(chip1: str, chip2: str) -> str:
@@ -125,21 +147,13 @@ def _index_pill(value: Any, prefix: str = '') -> str:
     """Render a colored pill for index changes - compact version."""
     v = _safe_float(value, None)
     if v is None:
-        bg, color, sign, txt = '#6B7280', '#FFFFFF', '', '--'
+        open_tag, sign = _PILL_OPEN[None]
+        txt = '--'
     else:
-        if v >= 0:
-            bg, color, sign = '#10B981', '#FFFFFF', '▲'
-        else:
-            bg, color, sign = '#EF4444', '#FFFFFF', '▼'
+        open_tag, sign = _PILL_OPEN[v >= 0]
         txt = f'{abs(v):.1f}%'
     
-    return (
-        '<span style="background:' + bg + ';color:' + color + ';padding:3px 7px;'
-        'border-radius:8px;font-size:11px;font-weight:600;display:inline-block;'
-        'margin:2px;white-space:nowrap;'
-        'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;">'
-        + prefix + sign + txt + '</span>'
-    )
+    return open_tag + prefix + sign + txt + '</span>'
 
 
 # ---------------------------------------------------------------------------
@@ -378,23 +392,25 @@ def _get_economic_calendar(assets: List[Dict[str, Any]], today: datetime = None)
     return _get_relevant_economic_events(tradeable_assets, today)
 
 
-def _render_economic_calendar(events: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> str:
-    """Render economic calendar with only portfolio-relevant events."""
-    if not events:
-        return ''
-    
-    html = '''
+_CALENDAR_OPEN = '''
     <div style="background:#EFF6FF;border:1px solid #0284C7;border-radius:12px;padding:12px;margin:12px 0;">
         <div style="font-size:11px;font-weight:700;color:#075985;margin-bottom:8px;
                     text-transform:uppercase;letter-spacing:0.5px;">
             📅 RELEVANT EVENTS
         </div>
     '''
+
+def _render_economic_calendar(events: List[Dict[str, Any]], assets: List[Dict[str, Any]]) -> str:
+    """Render economic calendar with only portfolio-relevant events."""
+    if not events:
+        return ''
+    
+    parts = [_CALENDAR_OPEN]
     
     for event in events[:2]:  # Show top 2 relevant events
         impact_color = '#DC2626'  # All relevant events are high impact by definition
         
-        html += f'''
+        parts.append(f'''
         <div style="margin:8px 0;padding:8px;background:#FFFFFF;
                     border-radius:8px;border-left:3px solid {impact_color};">
             <div style="font-size:13px;font-weight:600;color:#111827;margin-bottom:2px;">
@@ -407,10 +423,10 @@ def _render_economic_calendar(events: List[Dict[str, Any]], assets: List[Dict[st
                 Action: {escape(event['action'])}
             </div>
         </div>
-        '''
+        ''')
     
-    html += '</div>'
-    return html
+    parts.append('</div>')
+    return ''.join(parts)
 
 
 # ---------------------------------------------------------------------------
@@ -422,38 +438,38 @@ def _render_momentum_badge(momentum: Dict[str, Any]) -> str:
     if not momentum:
         return ''
     
-    html = '<div style="margin:8px 0;padding:6px;background:#F3F4F6;border-radius:8px;">'
+    parts = ['<div style="margin:8px 0;padding:6px;background:#F3F4F6;border-radius:8px;">']
     
     # Momentum streak
     if 'momentum' in momentum:
         color = momentum.get('momentum_color', '#6B7280')
-        html += f'''
+        parts.append(f'''
         <span style="background:{color};color:white;padding:3px 8px;border-radius:6px;
                      font-size:11px;font-weight:600;margin-right:6px;">
             {escape(momentum['momentum'])}
         </span>
-        '''
+        ''')
     
     # RSI indicator
     if 'rsi_signal' in momentum and momentum['rsi_signal']:
-        html += f'''
+        parts.append(f'''
         <span style="background:#FEF3C7;color:#92400E;padding:3px 8px;border-radius:6px;
                      font-size:11px;font-weight:600;margin-right:6px;">
             RSI: {momentum.get('rsi', 'N/A')} {escape(momentum['rsi_signal'])}
         </span>
-        '''
+        ''')
     
     # Volume alert
     if 'volume_alert' in momentum:
-        html += f'''
+        parts.append(f'''
         <span style="background:#DBEAFE;color:#1E40AF;padding:3px 8px;border-radius:6px;
                      font-size:11px;font-weight:600;">
             {escape(momentum['volume_alert'])}
         </span>
-        '''
+        ''')
     
-    html += '</div>'
-    return html
+    parts.append('</div>')
+    return ''.join(parts)
 
 
 # Mapping of category codes to human-readable names
@@ -663,8 +679,7 @@ def _render_heroes(heroes: Iterable[Dict[str, Any]]) -> str:
         label = '● BREAKING' if i == 0 else '● ALSO BREAKING'
         # Truncate description gracefully
         if len(desc) > 180:
-            import re
-            sentences = re.split(r'[.!?]\s+', desc)
+            sentences = _SENTENCE_SPLIT_RE.split(desc)
             truncated = ''
             for s in sentences:
                 if len(truncated + s) <= 160:
@@ -700,13 +715,37 @@ def _render_heroes(heroes: Iterable[Dict[str, Any]]) -> str:
 def _card_shell(inner: str, section: str) -> str:
     """Wrap the inner HTML in a card container with moderate margins."""
     style = SECTION_STYLES.get(section, SECTION_STYLES['equity'])
-    return (
-        '<div style="border:1px solid ' + style['card_border'] + ';border-radius:13px;margin:0 0 10px;'
-        'box-shadow:0 2px 7px ' + style['card_shadow'] + ';background:' + style['card_bg'] + ';">'
-        '<table role="presentation" width="100%" cellpadding="0" cellspacing="0" '
-        'style="border-collapse:separate;margin:0;background:#FFFFFF;border-radius:12px;overflow:hidden;">'
-        + inner + '</table></div>'
-    )
+    return _CARD_SHELL_TMPL.format(inner=inner, **style)
+
+
+# Static card markup; only the per-asset fields are filled in with str.format
+_CARD_SHELL_TMPL = (
+    '<div style="border:1px solid {card_border};border-radius:13px;margin:0 0 10px;'
+    'box-shadow:0 2px 7px {card_shadow};background:{card_bg};">'
+    '<table role="presentation" width="100%" cellpadding="0" cellspacing="0" '
+    'style="border-collapse:separate;margin:0;background:#FFFFFF;border-radius:12px;overflow:hidden;">'
+    '{inner}</table></div>'
+)
+
+_ASSET_CARD_TMPL = (
+    '<tr><td style="padding:16px 14px;max-height:400px;overflow:hidden;vertical-align:top;">'
+    '<table role="presentation" width="100%" cellpadding="0" cellspacing="0">'
+    '<tr><td style="font-weight:700;font-size:16px;line-height:1.25;color:#111827;'
+    'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;padding-bottom:4px;">'
+    '{name}</td></tr>'
+    '<tr><td><table role="presentation" width="100%" cellpadding="0" cellspacing="0"><tr>'
+    '<td style="font-size:12px;color:#6B7280;font-weight:600;">{ticker_display}</td>'
+    '<td style="text-align:right;font-size:15px;">{price}</td>'
+    '</tr></table></td></tr>'
+    '<tr><td>{chips}</td></tr>'
+    '{momentum}'
+    '<tr><td>{range}</td></tr>'
+    '{bullets}'
+    '<tr><td style="border-top:1px solid #E5E7EB;padding-top:10px;">'
+    '{news}{press}'
+    '</td></tr>'
+    '</table></td></tr>'
+)
 
 
 def _build_asset_card(c: Dict[str, Any]) -> str:
@@ -777,25 +816,16 @@ def _build_asset_card(c: Dict[str, Any]) -> str:
         )
     
     # Compose the inner structure with moderate padding
-    inner = (
-        '<tr><td style="padding:16px 14px;max-height:400px;overflow:hidden;vertical-align:top;">'
-        '<table role="presentation" width="100%" cellpadding="0" cellspacing="0">'
-        '<tr><td style="font-weight:700;font-size:16px;line-height:1.25;color:#111827;'
-        'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;padding-bottom:4px;">'
-        + escape(name) + '</td></tr>'
-        '<tr><td><table role="presentation" width="100%" cellpadding="0" cellspacing="0"><tr>'
-        '<td style="font-size:12px;color:#6B7280;font-weight:600;">' + ticker_display + '</td>'
-        '<td style="text-align:right;font-size:15px;">' + price_fmt + '</td>'
-        '</tr></table></td></tr>'
-        '<tr><td>' + chips_html + '</td></tr>'
-        + (f'<tr><td>{momentum_html}</td></tr>' if momentum_html else '')
-        + '<tr><td>' + range_html + '</td></tr>'
-        + bullets_html +
-        '<tr><td style="border-top:1px solid #E5E7EB;padding-top:10px;">'
-        + _button('News', c.get('news_url') or f'https://finance.yahoo.com/quote/{escape(ticker)}/news')
-        + _button('Press', c.get('pr_url') or f'https://finance.yahoo.com/quote/{escape(ticker)}/press-releases', secondary=True)
-        + '</td></tr>'
-        '</table></td></tr>'
+    inner = _ASSET_CARD_TMPL.format(
+        name=escape(name),
+        ticker_display=ticker_display,
+        price=price_fmt,
+        chips=chips_html,
+        momentum=f'<tr><td>{momentum_html}</td></tr>' if momentum_html else '',
+        range=range_html,
+        bullets=bullets_html,
+        news=_button('News', c.get('news_url') or f'https://finance.yahoo.com/quote/{escape(ticker)}/news'),
+        press=_button('Press', c.get('pr_url') or f'https://finance.yahoo.com/quote/{escape(ticker)}/press-releases', secondary=True),
     )
     return _card_shell(inner, section)
 
@@ -922,6 +952,48 @@ def _normalize_inputs(*args: Any, **kwargs: Any) -> tuple[Dict[str, Any], List[D
     return summary, assets
 
 
+# Enhanced responsive CSS with PROPERLY FIXED indices 2x2 mobile layout
+_EMAIL_CSS = (
+    '<style>'
+    '@media only screen and (max-width: 640px) {'
+    '.stack-col{display:block!important;width:100%!important;max-width:100%!important;padding:0!important;margin-bottom:12px}'
+    '.section-title{font-size:24px!important;line-height:1.15!important}'
+    '.chip{font-size:11px!important;padding:3px 6px!important;margin:2px!important}'
+    '.section-container td{padding:14px 8px!important}'
+    '.outer-padding{padding:8px 4px!important}'
+    '.main-container{padding:12px 8px!important;background:#FFFFFF!important}'
+    '/* Indices bar mobile 2x2 grid - FORCE WRAPPING */'
+    '.indices-container{white-space:normal!important}'
+    '.index-cell-wrapper{width:47%!important;display:inline-block!important;vertical-align:top!important;margin:1%!important}'
+    '}'
+    '</style>'
+)
+
+# Static document shell around the body rows; only the <title> varies per email
+_EMAIL_HEAD = (
+    '<!DOCTYPE html><html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">'
+    + _EMAIL_CSS + '<title>'
+)
+_EMAIL_BODY_OPEN = (
+    '</title></head>'
+    '<body style="margin:0;padding:0;background:#FFFFFF;"><center style="width:100%;background:#FFFFFF;">'
+    '<table role="presentation" cellpadding="0" cellspacing="0" width="600" '
+    'style="margin:0 auto;background:#FFFFFF;border-radius:14px;overflow:hidden;">'
+)
+_EMAIL_HEADER_TMPL = (
+    '<tr><td style="padding:18px 14px 10px 14px;text-align:left;">'
+    '<div style="font-size:27px;font-weight:700;color:#111827;'
+    'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;">{title}</div>'
+    '<div style="font-size:13px;color:#6B7280;margin-top:3px;">{subtitle}</div>'
+    '<div style="font-size:11px;color:#9CA3AF;margin-top:6px;">As of {as_of}</div>'
+    '</td></tr>'
+)
+_EMAIL_FOOT = (
+    '<tr><td style="padding:16px;color:#6B7280;font-size:11px;text-align:center;">You are receiving this digest based on your watchlist.</td></tr>'
+    '</table></center></body></html>'
+)
+
+
 def render_email(*args: Any, **kwargs: Any) -> str:
     """
     Render the full email HTML with dynamic header and clean section styling.
@@ -992,41 +1064,19 @@ def render_email(*args: Any, **kwargs: Any) -> str:
     # Compose final HTML
     as_of = _fmt_ct(summary.get('as_of_ct'), force_time=True, tz_suffix_policy='always')
     
-    # Enhanced responsive CSS with PROPERLY FIXED indices 2x2 mobile layout
-    css = (
-        '<style>'
-        '@media only screen and (max-width: 640px) {'
-        '.stack-col{display:block!important;width:100%!important;max-width:100%!important;padding:0!important;margin-bottom:12px}'
-        '.section-title{font-size:24px!important;line-height:1.15!important}'
-        '.chip{font-size:11px!important;padding:3px 6px!important;margin:2px!important}'
-        '.section-container td{padding:14px 8px!important}'
-        '.outer-padding{padding:8px 4px!important}'
-        '.main-container{padding:12px 8px!important;background:#FFFFFF!important}'
-        '/* Indices bar mobile 2x2 grid - FORCE WRAPPING */'
-        '.indices-container{white-space:normal!important}'
-        '.index-cell-wrapper{width:47%!important;display:inline-block!important;vertical-align:top!important;margin:1%!important}'
-        '}'
-        '</style>'
-    )
-    
-    # Main email with dynamic header and indices bar at top
-    return (
-        '<!DOCTYPE html><html><head><meta charset="UTF-8"><meta name="viewport" content="width=device-width,initial-scale=1">'
-        + css + '<title>' + escape(header_title) + '</title></head>'
-        '<body style="margin:0;padding:0;background:#FFFFFF;"><center style="width:100%;background:#FFFFFF;">'
-        '<table role="presentation" cellpadding="0" cellspacing="0" width="600" '
-        'style="margin:0 auto;background:#FFFFFF;border-radius:14px;overflow:hidden;">'
-        '<tr><td style="padding:18px 14px 10px 14px;text-align:left;">'
-        '<div style="font-size:27px;font-weight:700;color:#111827;'
-        'font-family:-apple-system,BlinkMacSystemFont,Segoe UI,sans-serif;">' + escape(header_title) + '</div>'
-        '<div style="font-size:13px;color:#6B7280;margin-top:3px;">' + escape(header_subtitle) + '</div>'
-        '<div style="font-size:11px;color:#9CA3AF;margin-top:6px;">As of ' + escape(as_of) + '</div>'
-        '</td></tr>'
-        '<tr><td style="padding:0 14px;">' + indices_html + '</td></tr>'
-        '<tr><td style="padding:0 14px;">' + daily_focus_html + '</td></tr>'
-        '<tr><td style="padding:0 14px;">' + economic_calendar_html + '</td></tr>'
-        '<tr><td style="padding:0 14px;">' + breaking_html + '</td></tr>'
-        '<tr><td style="padding:0 14px;">' + ''.join(section_html_parts) + '</td></tr>'
-        '<tr><td style="padding:16px;color:#6B7280;font-size:11px;text-align:center;">You are receiving this digest based on your watchlist.</td></tr>'
-        '</table></center></body></html>'
-    )
+    # Main email with dynamic header and indices bar at top; fragments are joined once
+    row_open = '<tr><td style="padding:0 14px;">'
+    row_close = '</td></tr>'
+    parts = [
+        _EMAIL_HEAD, escape(header_title), _EMAIL_BODY_OPEN,
+        _EMAIL_HEADER_TMPL.format(title=escape(header_title), subtitle=escape(header_subtitle), as_of=escape(as_of)),
+        row_open, indices_html, row_close,
+        row_open, daily_focus_html, row_close,
+        row_open, economic_calendar_html, row_close,
+        row_open, breaking_html, row_close,
+        row_open,
+    ]
+    parts.extend(section_html_parts)
+    parts.append(row_close)
+    parts.append(_EMAIL_FOOT)
+    return ''.join(parts)